@@ -1,10 +1,15 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Header
 from supabase import create_client
 import os
+import hmac
 import logging
+from typing import Optional
 from .services.creator_service import CreatorService
 from .services.email_service import EmailService
 from .services.call_service import CallService
+from .services.replica_service import get_replica
+from .services.search_service import get_search_index
+from .middleware.profiling import get_profile_store
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +34,7 @@ def get_supabase():
 
 def get_creator_service(supabase = Depends(get_supabase)):
     try:
-        return CreatorService(supabase)
+        return CreatorService(supabase, replica=get_replica(), search_index=get_search_index())
     except Exception as e:
         logger.error(f"Failed to initialize CreatorService: {str(e)}")
         raise HTTPException(
@@ -55,4 +60,22 @@ def get_call_service():
         raise HTTPException(
             status_code=500,
             detail="Call service initialization failed"
-        )
\ No newline at end of file
+        )
+
+def get_search_service():
+    search_index = get_search_index()
+    if search_index is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Search is not enabled"
+        )
+    return search_index
+
+def get_authorized_profile_store(x_profile: Optional[str] = Header(None)):
+    store = get_profile_store()
+    token = os.environ.get("PROFILING_TOKEN")
+    if store is None or not token:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not x_profile or not hmac.compare_digest(x_profile, token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    return store
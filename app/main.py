@@ -3,8 +3,19 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import creators
+from app.routers import creators, profiling, health, exports
+from app.middleware.admission_control import AdmissionControlMiddleware, admission_control_enabled, trusted_proxies
+from app.middleware.profiling import ProfilingMiddleware, get_profile_store
+from app.services.replica_service import get_replica
+from app.services.search_service import get_search_index
+from app.services.outbox_service import get_outbox, EmailDispatcher
+from app.services.health_service import get_health_prober
+from app.services.email_service import EmailService
+from app.services.creator_service import CreatorService
+from app.dependencies import get_supabase
+import asyncio
 import logging
+import os
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +25,25 @@ logging.basicConfig(
 
 app = FastAPI(title="Creator Platform API")
 
+# Opt-in request profiling; not installed at all unless PROFILING_ENABLED is set
+profile_store = get_profile_store()
+if profile_store is not None:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        token=os.environ.get("PROFILING_TOKEN"),
+        sample_rate=float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+    )
+
+# Admission control: per-client rate limits and per-route concurrency with load shedding.
+# Added before CORS so rejections still carry CORS headers.
+if admission_control_enabled():
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        max_in_flight=int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", "128")),
+        trusted_proxies=trusted_proxies()
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -23,8 +53,83 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+logger = logging.getLogger(__name__)
+
+
+def build_search_index(search_index) -> None:
+    """Populate the search index from Supabase; runs in a worker thread at startup."""
+    try:
+        search_index.build_from_supabase(get_supabase())
+    except Exception as e:
+        logger.error(f"Failed to build search index: {getattr(e, 'detail', None) or str(e)}")
+
+
+def index_replica(replica, search_index) -> None:
+    """Index every row the replica already holds; runs in a worker thread at startup."""
+    try:
+        for table in ("creators", "activities"):
+            search_index.index_rows(table, replica.iter_rows(table))
+        logger.info(f"Search index built from replica with {len(search_index)} documents")
+    except Exception as e:
+        logger.error(f"Failed to index replica: {str(e)}")
+
+
+async def start_replica(replica, search_index) -> None:
+    if search_index is not None:
+        # Index the local copy before syncing starts, so the index can't be handed an
+        # older copy of a row than the one a sync has already indexed
+        await asyncio.get_running_loop().run_in_executor(None, index_replica, replica, search_index)
+        replica.add_listener(search_index.index_rows)
+        replica.add_delete_listener(search_index.remove_rows)
+    replica.start()
+
+@app.on_event("startup")
+async def start_background_services():
+    get_health_prober().start()
+
+    replica = get_replica()
+    search_index = get_search_index()
+    if replica is not None:
+        # Reads fall back to Supabase until the replica's first sync completes
+        app.state.replica_startup = asyncio.get_running_loop().create_task(start_replica(replica, search_index))
+    elif search_index is not None:
+        # Without the replica the index only sees this process's own writes after the
+        # initial build, so with several workers results drift until the next restart.
+        # Enable REPLICA_ENABLED alongside SEARCH_INDEX_ENABLED for multi-worker deployments.
+        logger.warning("Search index enabled without the replica; writes from other workers won't be indexed")
+        asyncio.get_running_loop().run_in_executor(None, build_search_index, search_index)
+
+    outbox = get_outbox()
+    if outbox is not None:
+        try:
+            app.state.email_dispatcher = EmailDispatcher(
+                outbox,
+                EmailService(),
+                CreatorService(get_supabase(), replica=replica, search_index=search_index)
+            )
+            app.state.email_dispatcher.start()
+        except Exception as e:
+            logger.error(f"Failed to start email dispatcher: {str(e)}")
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await get_health_prober().stop()
+    replica_startup = getattr(app.state, "replica_startup", None)
+    if replica_startup is not None:
+        replica_startup.cancel()
+    replica = get_replica()
+    if replica is not None:
+        await replica.stop()
+    dispatcher = getattr(app.state, "email_dispatcher", None)
+    if dispatcher is not None:
+        await dispatcher.stop()
+
 # Include routers
 app.include_router(creators.router, tags=["creators"])
+app.include_router(health.router)
+app.include_router(exports.router)
+if profile_store is not None:
+    app.include_router(profiling.router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,239 @@
+import os
+import re
+import json
+import math
+import time
+import asyncio
+import logging
+import ipaddress
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Pattern
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteClass:
+    """Admission limits for a class of routes."""
+    name: str
+    methods: Tuple[str, ...]
+    path_pattern: Pattern
+    rate: float               # Sustained requests per second per client
+    burst: int                # Token bucket size per client
+    max_concurrency: int      # Requests of this class running at once
+    max_queue: int            # Requests of this class allowed to wait for a slot
+    queue_timeout: float      # Seconds a request may wait before being shed
+    shed_fraction: float      # Shed once global in-flight reaches this fraction of capacity
+
+
+# Matched in order; cheap reads shed last, LLM and telephony routes shed first
+DEFAULT_ROUTE_CLASSES = [
+    RouteClass("llm", ("POST",), re.compile(r"^/creators/[^/]+/generate-contract$"),
+               rate=0.2, burst=3, max_concurrency=4, max_queue=8, queue_timeout=10.0, shed_fraction=0.6),
+    RouteClass("telephony", ("POST",), re.compile(r"^/creators/[^/]+/call$"),
+               rate=0.2, burst=3, max_concurrency=4, max_queue=8, queue_timeout=5.0, shed_fraction=0.6),
+    RouteClass("write", ("POST", "PUT", "PATCH", "DELETE"), re.compile(r".*"),
+               rate=5.0, burst=20, max_concurrency=32, max_queue=64, queue_timeout=5.0, shed_fraction=0.85),
+    RouteClass("read", ("GET", "HEAD"), re.compile(r".*"),
+               rate=20.0, burst=60, max_concurrency=96, max_queue=192, queue_timeout=2.0, shed_fraction=1.0),
+]
+
+# Never rate limited or shed
+EXEMPT_PATHS = {"/", "/health/live", "/health/ready", "/creators/test-groq"}
+
+# Drop idle client buckets once this many are tracked
+MAX_TRACKED_CLIENTS = 10000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = now
+
+    def take(self, now: float) -> float:
+        """Take a token. Returns 0 on success, otherwise seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+
+class ConcurrencyLimiter:
+    """Bounded-concurrency gate with a bounded FIFO wait queue."""
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: deque = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # Hand the slot directly to the next live waiter, otherwise free it
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware enforcing per-client token buckets and per-route-class concurrency
+    limits. Requests over their client's rate get 429; requests that would queue too
+    deep, wait too long, or arrive while the server is near capacity get 503. Both
+    carry a Retry-After header.
+
+    Clients are keyed by their socket address. `X-Forwarded-For` is only honoured
+    when the connection comes from one of `trusted_proxies` (IPs or CIDR ranges),
+    since any client can send the header to pick its own rate-limit bucket.
+    """
+
+    def __init__(
+        self,
+        app,
+        route_classes: Optional[List[RouteClass]] = None,
+        max_in_flight: int = 128,
+        trusted_proxies: Iterable[str] = (),
+        clock=time.monotonic
+    ):
+        self.app = app
+        self.route_classes = route_classes or DEFAULT_ROUTE_CLASSES
+        self.max_in_flight = max_in_flight
+        self.clock = clock
+        self.trusted_proxies = [ipaddress.ip_network(proxy.strip(), strict=False) for proxy in trusted_proxies]
+        self.in_flight = 0
+        self._limiters: Dict[str, ConcurrencyLimiter] = {
+            route_class.name: ConcurrencyLimiter(route_class.max_concurrency, route_class.max_queue)
+            for route_class in self.route_classes
+        }
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def classify(self, method: str, path: str) -> Optional[RouteClass]:
+        for route_class in self.route_classes:
+            if method in route_class.methods and route_class.path_pattern.match(path):
+                return route_class
+        return None
+
+    def _is_trusted_proxy(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+    def client_key(self, scope) -> str:
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        if not self._is_trusted_proxy(peer):
+            return peer
+        for name, value in scope.get("headers") or []:
+            if name == b"x-forwarded-for":
+                # Walk back from the nearest hop; the first untrusted address is the client
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                for hop in reversed(hops):
+                    if not self._is_trusted_proxy(hop):
+                        return hop
+                return hops[0] if hops else peer
+        return peer
+
+    def _take_token(self, route_class: RouteClass, client: str) -> float:
+        now = self.clock()
+        key = (route_class.name, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_CLIENTS:
+                self._prune_buckets(now)
+            bucket = self._buckets[key] = TokenBucket(route_class.rate, route_class.burst, now)
+        return bucket.take(now)
+
+    def _prune_buckets(self, now: float) -> None:
+        # A bucket that would have refilled completely carries no state worth keeping
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket.tokens + (now - bucket.updated_at) * bucket.rate < bucket.burst
+        }
+
+    async def _reject(self, send, status_code: int, detail: str, retry_after: float) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = self.client_key(scope)
+        wait = self._take_token(route_class, client)
+        if wait:
+            await self._reject(send, 429, "Rate limit exceeded", wait)
+            return
+
+        # Under global pressure, shed expensive classes before cheap reads
+        if self.in_flight >= self.max_in_flight * route_class.shed_fraction:
+            logger.warning(f"Shedding {route_class.name} request to {scope['path']} ({self.in_flight} in flight)")
+            await self._reject(send, 503, "Server is busy, please retry", 1)
+            return
+
+        limiter = self._limiters[route_class.name]
+        self.in_flight += 1
+        try:
+            if not await limiter.acquire(route_class.queue_timeout):
+                logger.warning(f"Shedding {route_class.name} request to {scope['path']} (queue {limiter.queued})")
+                await self._reject(send, 503, "Server is busy, please retry", route_class.queue_timeout)
+                return
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                limiter.release()
+        finally:
+            self.in_flight -= 1
+
+
+def admission_control_enabled() -> bool:
+    return os.environ.get("ADMISSION_CONTROL_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def trusted_proxies() -> List[str]:
+    return [proxy.strip() for proxy in os.environ.get("ADMISSION_TRUSTED_PROXIES", "").split(",") if proxy.strip()]
@@ -0,0 +1,149 @@
+import os
+import io
+import hmac
+import time
+import uuid
+import pstats
+import random
+import asyncio
+import cProfile
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Profile retrieval sends the same X-Profile token; profiling it would evict real traces
+EXCLUDED_PATH_PREFIXES = ("/profiles",)
+
+
+class ProfileStore:
+    """Keeps the most recent request profiles on disk as .prof (pstats) and .txt summaries."""
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, profile_id: str, extension: str) -> Optional[str]:
+        # Profile IDs are UUID hex strings; reject anything else to keep paths inside the store
+        if not profile_id.isalnum():
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.{extension}")
+        return path if os.path.exists(path) else None
+
+    def save(self, profile_id: str, profiler: cProfile.Profile, method: str, path: str, elapsed: float) -> None:
+        profiler.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+
+        summary = io.StringIO()
+        summary.write(f"{method} {path} took {elapsed * 1000:.1f} ms\n\n")
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats("cumulative").print_stats(40)
+        with open(os.path.join(self.directory, f"{profile_id}.txt"), "w") as f:
+            f.write(summary.getvalue())
+
+        self._evict()
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".txt"):
+                full_path = os.path.join(self.directory, name)
+                with open(full_path) as f:
+                    headline = f.readline().strip()
+                profiles.append({
+                    "id": name[:-4],
+                    "request": headline,
+                    "created_at": os.path.getmtime(full_path)
+                })
+        return sorted(profiles, key=lambda profile: profile["created_at"], reverse=True)
+
+    def _evict(self) -> None:
+        for profile in self.list()[self.max_profiles:]:
+            for extension in ("prof", "txt"):
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile['id']}.{extension}"))
+                except OSError:
+                    pass
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that runs cProfile around selected requests: those carrying an
+    `X-Profile` header equal to the configured token, plus a random `sample_rate`
+    fraction of all requests. The profile ID is returned in `X-Profile-Id`.
+
+    cProfile observes the event loop thread, so code from other requests interleaved
+    at await points can appear in a trace; only one request is profiled at a time.
+    Sync endpoints run in the threadpool and are not captured. Requests to the
+    profile retrieval routes are never profiled.
+    """
+
+    def __init__(self, app, store: ProfileStore, token: Optional[str] = None, sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.token = token.encode("latin-1") if token else None
+        self.sample_rate = sample_rate
+        self._active = False
+
+    def _should_profile(self, scope) -> bool:
+        if self._active or scope["path"].startswith(EXCLUDED_PATH_PREFIXES):
+            return False
+        if self.token:
+            for name, value in scope.get("headers") or []:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile_id.encode("latin-1"))
+                ])
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            try:
+                # Writing files and formatting pstats is slow; keep it off the event loop
+                await asyncio.to_thread(self.store.save, profile_id, profiler, scope["method"], scope["path"], elapsed)
+                logger.info(f"Saved profile {profile_id} for {scope['method']} {scope['path']} ({elapsed * 1000:.1f} ms)")
+            except Exception as e:
+                logger.error(f"Failed to save profile {profile_id}: {str(e)}")
+
+
+_profile_store: Optional[ProfileStore] = None
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_profile_store() -> Optional[ProfileStore]:
+    """Return the process-wide profile store, or None when profiling is disabled."""
+    global _profile_store
+    if not profiling_enabled():
+        return None
+    if _profile_store is None:
+        _profile_store = ProfileStore(
+            os.environ.get("PROFILING_OUTPUT_DIR", "/tmp/profiles"),
+            max_profiles=int(os.environ.get("PROFILING_MAX_PROFILES", "50"))
+        )
+    return _profile_store
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends, Body, Response
-from ..schemas.creator import CreatorCreate, Activity, ActivityType, CallRequest, EmailRequest
+from fastapi import APIRouter, HTTPException, Depends, Body, Response, Query
+from fastapi.responses import JSONResponse
+from ..schemas.creator import CreatorCreate, Activity, ActivityType, CallRequest, EmailRequest, BulkStatusUpdate
 from ..services.creator_service import CreatorService
 from ..services.call_service import CallService
 from ..services.email_service import EmailService
-from ..services.generate_contract import generate_contract_for_creator, test_groq_connection
-from ..dependencies import get_creator_service
+from ..services.generate_contract import generate_contract_for_creator, served_model
+from ..services.health_service import get_health_prober, STATUS_OK
+from ..services.search_service import SearchIndex
+from ..services.outbox_service import get_outbox
+from ..dependencies import get_creator_service, get_search_service
+import asyncio
 import logging
 import traceback
 from datetime import datetime
+from typing import List, Optional
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +21,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="", tags=["creators"])  # Remove '/creators' prefix to avoid duplication
 
+# Maps the search `scope` parameter to index document kinds
+SEARCH_SCOPES = {"all": None, "creators": ["creator"], "activities": ["activity"]}
+
 @router.get("/creators", response_model=list)
 async def get_all_creators(creator_service: CreatorService = Depends(get_creator_service)):
     """Retrieve all creators with all fields."""
@@ -25,6 +34,61 @@ async def get_all_creators(creator_service: CreatorService = Depends(get_creator
         logger.error(f"Error retrieving creators: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/creators/search")
+async def search_creators(
+    q: str = Query(..., min_length=1, description="Search terms; each term also matches as a prefix"),
+    scope: str = Query("all", regex="^(all|creators|activities)$"),
+    types: Optional[List[ActivityType]] = Query(None, description="Only return activities of these types"),
+    creator_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    search_index: SearchIndex = Depends(get_search_service)
+):
+    """Ranked full-text and prefix search over creator names/handles and activity bodies."""
+    try:
+        # Type filters only apply to activities, so they narrow the scope to activities
+        kinds = ["activity"] if types else SEARCH_SCOPES[scope]
+        # Scoring is CPU-bound; keep it off the event loop
+        results = await asyncio.to_thread(
+            search_index.search,
+            q,
+            kinds=kinds,
+            activity_types=types,
+            creator_id=creator_id,
+            limit=limit
+        )
+        return {"status": "success", "count": len(results), "data": results}
+    except Exception as e:
+        logger.error(f"Error searching: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/creators/status/bulk")
+async def bulk_update_creator_status(
+    update: BulkStatusUpdate,
+    creator_service: CreatorService = Depends(get_creator_service)
+):
+    """
+    Move many creators to a new status in one request. Send either `creator_ids`
+    with a single `status`, or a `statuses` mapping of creator ID to status.
+    """
+    if update.statuses:
+        status_by_id = dict(update.statuses)
+    elif update.status and update.creator_ids:
+        status_by_id = {creator_id: update.status for creator_id in update.creator_ids}
+    else:
+        raise HTTPException(status_code=400, detail="Provide creator_ids with status, or a statuses mapping")
+    
+    try:
+        result = await creator_service.bulk_update_creator_status(status_by_id)
+        return {
+            "status": "success",
+            "updated_count": len(result["updated"]),
+            "not_found": result["not_found"],
+            "data": result["updated"]
+        }
+    except Exception as e:
+        logger.error(f"Error in bulk_update_creator_status: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/creators/{creator_id}/activities")
 async def create_activity(
     creator_id: str, 
@@ -107,13 +171,39 @@ async def send_email_to_creator(
     creator_service: CreatorService = Depends(get_creator_service),
     email_service: EmailService = Depends()
 ):
-    """Send an email to a creator"""
+    """
+    Send an email to a creator. With the outbox enabled the email is queued locally
+    and 202 is returned; the dispatcher sends it and logs the delivery outcome.
+    """
     try:
         # Get creator information
         creator = await creator_service.get_creator(creator_id)
         if not creator.get('email'):
             raise HTTPException(status_code=400, detail="Creator has no email address")
         
+        outbox = get_outbox()
+        if outbox is not None:
+            message = {
+                "to_email": creator['email'],
+                "subject": email_request.subject,
+                "body": email_request.body,
+                "cc": email_request.cc,
+                "bcc": email_request.bcc
+            }
+            activity_data = {
+                "creator_id": creator_id,
+                "type": ActivityType.EMAIL_SENT,
+                "metadata": {
+                    "body": f"""Email sent to {creator['name']} (@{creator['handle']}):\nSubject: {email_request.subject}\nTo: {creator['email']}\nContent: {email_request.body[:500]}..."""
+                },
+                "created_at": datetime.now().isoformat()
+            }
+            message_id = outbox.enqueue(creator_id, message, activity_data)
+            return JSONResponse(
+                status_code=202,
+                content={"status": "queued", "message_id": message_id}
+            )
+        
         # Send the email (removed from_email argument)
         result = await email_service.send_email(
             to_email=creator['email'],
@@ -123,11 +213,11 @@ async def send_email_to_creator(
             bcc=email_request.bcc
         )
         
-        # Log the email activity
+        # Log the email activity with the actual delivery outcome
         activity_data = {
             "creator_id": creator_id,
             "type": ActivityType.EMAIL_SENT,
-            "status": "completed",
+            "status": "completed" if result.get("status") == "success" else "failed",
             "metadata": {
                 "body": f"""Email sent to {creator['name']} (@{creator['handle']}):\nSubject: {email_request.subject}\nTo: {creator['email']}\nFrom: {result.get('from')}\nContent: {email_request.body[:500]}..."""
             },
@@ -136,25 +226,46 @@ async def send_email_to_creator(
         }
         await creator_service.log_activity(activity_data)
         
+        if result.get("status") != "success":
+            raise HTTPException(status_code=502, detail=f"Email delivery failed: {result.get('detail')}")
         return {"status": "success", "data": result}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error sending email: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/creators/{creator_id}/email/{message_id}")
+async def get_queued_email_status(creator_id: str, message_id: str):
+    """Delivery status of an email queued through the outbox."""
+    outbox = get_outbox()
+    if outbox is None:
+        raise HTTPException(status_code=404, detail="Email outbox is not enabled")
+    message = outbox.get_message(message_id)
+    if not message or message["creator_id"] != creator_id:
+        raise HTTPException(status_code=404, detail=f"Queued email {message_id} not found")
+    return {"status": "success", "data": message}
+
 @router.post("/creators/{creator_id}/generate-contract")
-async def generate_contract(creator_id: str, response: Response):
+async def generate_contract(
+    creator_id: str,
+    response: Response,
+    mode: Optional[str] = Query(None, regex="^(llm|template)$")
+):
     """
     Generate a contract for a creator based on their email conversations.
     
     This endpoint retrieves all email conversations for the creator,
     then uses Groq's LLM to generate a formal contract based on the conversation content.
+    With `mode=template` the LLM only extracts the variable terms and the contract
+    is assembled from fixed clause templates.
     """
     try:
         logger.info(f"Generate contract endpoint called with creator_id: {creator_id}")
         
         # Generate contract using the Groq-based service
-        contract_text = await generate_contract_for_creator(creator_id)
+        contract_text = await generate_contract_for_creator(creator_id, mode=mode)
         
         if not contract_text:
             logger.error(f"Empty contract text received for creator_id: {creator_id}")
@@ -166,7 +277,8 @@ async def generate_contract(creator_id: str, response: Response):
         return {
             "status": "success",
             "creator_id": creator_id,
-            "contract": contract_text
+            "contract": contract_text,
+            "model": served_model.get()
         }
         
     except HTTPException as he:
@@ -179,11 +291,15 @@ async def generate_contract(creator_id: str, response: Response):
         return {"detail": f"Internal server error: {str(e)}"}
 
 @router.get("/creators/test-groq")
-def test_groq():
-    """Test endpoint to verify Groq API connection"""
+async def test_groq():
+    """
+    Report Groq API reachability from the health prober's cache. This no longer runs a
+    billable completion; use /health/ready for all dependencies.
+    """
     try:
-        result = test_groq_connection()
-        return {"status": "success" if result else "failed", "groq_working": result}
+        result = get_health_prober().result("groq")
+        groq_working = result["status"] == STATUS_OK
+        return {"status": "success" if groq_working else "failed", "groq_working": groq_working, "check": result}
     except Exception as e:
         logger.error(f"Groq test failed: {str(e)}")
         logger.error(traceback.format_exc())
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Path
+from fastapi.responses import StreamingResponse
+from ..schemas.creator import ActivityType
+from ..services.export_service import stream_export, parquet_available, MEDIA_TYPES
+from ..dependencies import get_supabase
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+@router.get("/{table}")
+def export_table(
+    table: str = Path(..., regex="^(creators|activities)$"),
+    export_format: str = Query("csv", alias="format", regex="^(csv|ndjson|parquet)$"),
+    start: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    types: Optional[List[ActivityType]] = Query(None, description="Only activities of these types"),
+    compression: Optional[str] = Query(None, regex="^gzip$"),
+    supabase = Depends(get_supabase)
+):
+    """
+    Stream creators or activities as CSV, NDJSON or Parquet. Rows are paged from
+    Supabase with keyset cursors and written straight to the response.
+    """
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow to be installed")
+    
+    filename = f"{table}.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+    if compression == "gzip" and export_format != "parquet":
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    logger.info(f"Starting {export_format} export of {table} (start={start}, end={end}, types={types})")
+    return StreamingResponse(
+        stream_export(
+            supabase,
+            table,
+            export_format,
+            start=start,
+            end=end,
+            activity_types=types,
+            compression=compression
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Response
+from ..services.health_service import get_health_prober
+import time
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/live")
+async def liveness():
+    """Process is up and serving requests. Never touches upstream services."""
+    return {"status": "alive", "uptime_seconds": round(time.time() - get_health_prober().started_at, 1)}
+
+@router.get("/ready")
+async def readiness(response: Response):
+    """Cached upstream reachability and latency; 503 while a critical dependency is not ok."""
+    result = get_health_prober().readiness()
+    if not result["ready"]:
+        response.status_code = 503
+    return {"status": "ready" if result["ready"] else "not_ready", **result}
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse, PlainTextResponse
+from ..middleware.profiling import ProfileStore
+from ..dependencies import get_authorized_profile_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/profiles", tags=["profiling"])
+
+@router.get("")
+async def list_profiles(store: ProfileStore = Depends(get_authorized_profile_store)):
+    """List captured request profiles, newest first."""
+    return {"status": "success", "data": store.list()}
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile_summary(profile_id: str, store: ProfileStore = Depends(get_authorized_profile_store)):
+    """Text summary of a profile, sorted by cumulative time."""
+    path = store.path(profile_id, "txt")
+    if not path:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    with open(path) as f:
+        return f.read()
+
+@router.get("/{profile_id}/pstats")
+async def download_profile(profile_id: str, store: ProfileStore = Depends(get_authorized_profile_store)):
+    """Raw pstats dump, usable with snakeviz, flameprof or gprof2dot."""
+    path = store.path(profile_id, "prof")
+    if not path:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
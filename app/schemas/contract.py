@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ValidationInfo, field_validator
+from typing import Any, Optional, List
 from datetime import datetime
 
 class CreatorBase(BaseModel):
@@ -11,4 +11,50 @@ class CreatorBase(BaseModel):
 class ContractResponse(BaseModel):
     status: str
     contract_text: str
-    creator_id: str 
\ No newline at end of file
+    creator_id: str
+
+def _coerce_scalar(value: Any) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+class ExtractedModel(BaseModel):
+    """
+    Base for models filled from LLM output, which routinely returns numbers where
+    strings are expected and null for empty fields. Numbers are coerced to strings,
+    null falls back to the field default, and null list items are dropped.
+    """
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _lenient(cls, value: Any, info: ValidationInfo) -> Any:
+        if value is None:
+            return cls.model_fields[info.field_name].get_default(call_default_factory=True)
+        if isinstance(value, list):
+            return [_coerce_scalar(item) for item in value if item is not None]
+        return _coerce_scalar(value)
+
+class ContractParties(ExtractedModel):
+    agency_name: Optional[str] = None
+    agency_representative: Optional[str] = None
+    creator_name: Optional[str] = None
+    creator_handle: Optional[str] = None
+
+class ContractCompensation(ExtractedModel):
+    amount: Optional[str] = None
+    currency: Optional[str] = None
+    payment_terms: Optional[str] = None
+
+class ContractTimeline(ExtractedModel):
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    milestones: List[str] = []
+
+class ContractTerms(ExtractedModel):
+    """Variable contract terms extracted from the conversation history by the LLM."""
+    parties: ContractParties = ContractParties()
+    scope: List[str] = []
+    compensation: ContractCompensation = ContractCompensation()
+    timeline: ContractTimeline = ContractTimeline()
+    special_terms: List[str] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -35,4 +35,9 @@ class EmailRequest(BaseModel):
     body: str
     cc: Optional[str] = None
     bcc: Optional[str] = None
-    from_email: Optional[str] = None 
\ No newline at end of file
+    from_email: Optional[str] = None 
+
+class BulkStatusUpdate(BaseModel):
+    creator_ids: List[str] = []
+    status: Optional[str] = None
+    statuses: Optional[Dict[str, str]] = None  # Per-creator status, keyed by creator ID
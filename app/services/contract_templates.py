@@ -0,0 +1,109 @@
+from string import Template
+from typing import List, Optional
+from ..schemas.contract import ContractTerms
+
+NOT_SPECIFIED = "To be agreed in writing by both parties"
+
+# Clause library, compiled once at import. Sections 1-4 are filled from the
+# extracted terms; sections 5-7 are fixed boilerplate.
+CLAUSES = {
+    "title": Template("INFLUENCER SERVICES AGREEMENT"),
+    "parties": Template(
+        "1. PARTIES\n"
+        "This Influencer Services Agreement (the \"Agreement\") is entered into between "
+        "$agency_name (the \"Agency\")$agency_representative and $creator_name$creator_handle "
+        "(the \"Creator\"), each a \"Party\" and together the \"Parties\"."
+    ),
+    "scope": Template(
+        "2. SCOPE OF WORK\n"
+        "The Creator agrees to produce and publish the following deliverables for the Agency:\n"
+        "$deliverables\n"
+        "All content shall be original, comply with applicable advertising disclosure rules, "
+        "and be submitted to the Agency for review before publication."
+    ),
+    "compensation": Template(
+        "3. COMPENSATION\n"
+        "In consideration for the services, the Agency shall pay the Creator $amount.\n"
+        "Payment terms: $payment_terms."
+    ),
+    "timeline": Template(
+        "4. TIMELINE AND DELIVERABLES\n"
+        "Start date: $start_date\n"
+        "End date: $end_date\n"
+        "Milestones:\n"
+        "$milestones"
+    ),
+    "terms": Template(
+        "5. TERMS AND CONDITIONS\n"
+        "a) The Creator is an independent contractor and nothing in this Agreement creates an "
+        "employment, partnership or agency relationship.\n"
+        "b) The Creator grants the Agency a non-exclusive licence to share and promote the "
+        "delivered content for the term of this Agreement.\n"
+        "c) Each Party shall keep confidential any non-public information received from the "
+        "other Party.\n"
+        "d) Any changes to this Agreement must be made in writing and signed by both Parties.\n"
+        "$special_terms"
+    ),
+    "termination": Template(
+        "6. TERMINATION\n"
+        "Either Party may terminate this Agreement with fourteen (14) days' written notice. "
+        "Either Party may terminate immediately if the other Party materially breaches this "
+        "Agreement and fails to remedy the breach within seven (7) days of written notice. "
+        "On termination, the Agency shall pay for all deliverables completed and approved "
+        "up to the termination date."
+    ),
+    "signatures": Template(
+        "7. SIGNATURES\n"
+        "Agency: $agency_name\n"
+        "Signature: ______________________    Date: ____________\n\n"
+        "Creator: $creator_name\n"
+        "Signature: ______________________    Date: ____________"
+    ),
+}
+
+CLAUSE_ORDER = ["title", "parties", "scope", "compensation", "timeline", "terms", "termination", "signatures"]
+
+
+def _bullets(items: List[str], empty: str = NOT_SPECIFIED) -> str:
+    items = [item.strip() for item in items if item and item.strip()]
+    if not items:
+        return f"- {empty}"
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _or_default(value: Optional[str], default: str = NOT_SPECIFIED) -> str:
+    return value.strip() if value and value.strip() else default
+
+
+def assemble_contract(terms: ContractTerms) -> str:
+    """Render the full contract from the clause library and the extracted terms."""
+    parties = terms.parties
+    compensation = terms.compensation
+
+    amount = _or_default(compensation.amount, "")
+    if amount and compensation.currency and compensation.currency not in amount:
+        amount = f"{amount} {compensation.currency}"
+
+    special_terms = ""
+    if terms.special_terms:
+        special_terms = "e) The Parties additionally agree to the following specific terms:\n" + \
+            _bullets(terms.special_terms)
+
+    values = {
+        "agency_name": _or_default(parties.agency_name, "the Agency"),
+        "agency_representative": f", represented by {parties.agency_representative.strip()}"
+            if parties.agency_representative and parties.agency_representative.strip() else "",
+        "creator_name": _or_default(parties.creator_name, "the Creator"),
+        "creator_handle": f" (@{parties.creator_handle.strip().lstrip('@')})"
+            if parties.creator_handle and parties.creator_handle.strip() else "",
+        "deliverables": _bullets(terms.scope),
+        "amount": amount or "the amount agreed in writing by both Parties",
+        "payment_terms": _or_default(compensation.payment_terms, "within thirty (30) days of invoice"),
+        "start_date": _or_default(terms.timeline.start_date, "the date of the last signature below"),
+        "end_date": _or_default(terms.timeline.end_date, "on completion of all deliverables"),
+        "milestones": _bullets(terms.timeline.milestones),
+        "special_terms": special_terms,
+    }
+
+    sections = [CLAUSES[name].substitute(values).rstrip() for name in CLAUSE_ORDER]
+    return "\n\n".join(sections) + "\n"
@@ -1,13 +1,49 @@
+import uuid
 from datetime import datetime
+from typing import Optional, List, Dict
 from ..schemas.creator import CreatorCreate, Activity, ActivityType
+from .replica_service import CreatorReplica, ReplicaStaleError
+from .search_service import SearchIndex
 import logging
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
+# Max IDs per filtered update; the `in` filter travels in the URL, so keep it bounded
+BULK_UPDATE_CHUNK_SIZE = 200
+
+
+def _is_uuid(value) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
 class CreatorService:
-    def __init__(self, supabase):
+    def __init__(
+        self,
+        supabase,
+        replica: Optional[CreatorReplica] = None,
+        search_index: Optional[SearchIndex] = None
+    ):
         self.supabase = supabase
+        self.replica = replica
+        self.search_index = search_index
+
+    def _write_through(self, table: str, rows: list) -> None:
+        """Apply our own writes to the replica and search index so reads after writes are consistent."""
+        if self.replica is not None:
+            try:
+                self.replica.upsert_rows(table, rows)
+            except Exception as e:
+                logger.warning(f"Replica write-through to {table} failed: {str(e)}")
+        if self.search_index is not None:
+            try:
+                self.search_index.index_rows(table, rows)
+            except Exception as e:
+                logger.warning(f"Search index update for {table} failed: {str(e)}")
 
     async def create_creator(self, creator: CreatorCreate) -> dict:
         try:
@@ -18,6 +54,7 @@ class CreatorService:
             
             result = self.supabase.table("creators").insert(creator_data).execute()
             creator_record = result.data[0]
+            self._write_through("creators", [creator_record])
             
             # Log creator creation activity
             activity_data = {
@@ -40,6 +77,13 @@ class CreatorService:
     async def get_creator(self, creator_id: str) -> dict:
         """Get a specific creator by ID"""
         try:
+            if self.replica is not None:
+                try:
+                    creator = self.replica.get_creator(creator_id)
+                    if creator is not None:
+                        return creator
+                except ReplicaStaleError as e:
+                    logger.warning(f"Replica stale, reading creator from Supabase: {str(e)}")
             result = self.supabase.table("creators").select("*").eq("id", creator_id).execute()
             if not result.data:
                 raise HTTPException(status_code=404, detail=f"Creator with ID {creator_id} not found")
@@ -51,6 +95,11 @@ class CreatorService:
     async def get_all_creators(self) -> list:
         """Get all creators with all fields"""
         try:
+            if self.replica is not None:
+                try:
+                    return self.replica.get_all_creators()
+                except ReplicaStaleError as e:
+                    logger.warning(f"Replica stale, reading creators from Supabase: {str(e)}")
             result = self.supabase.table("creators").select("*").execute()
             return result.data
         except Exception as e:
@@ -63,6 +112,7 @@ class CreatorService:
             if "status" not in activity_data:
                 activity_data["status"] = "completed"
             result = self.supabase.table("activities").insert(activity_data).execute()
+            self._write_through("activities", result.data)
             return result.data[0]
         except Exception as e:
             logger.error(f"Error logging activity: {str(e)}")
@@ -78,6 +128,7 @@ class CreatorService:
             
             if not result.data:
                 raise Exception(f"Creator with ID {creator_id} not found")
+            self._write_through("creators", result.data)
             
             # Log status change activity
             activity_data = {
@@ -95,4 +146,55 @@ class CreatorService:
             return result.data[0]
         except Exception as e:
             logger.error(f"Error updating creator status: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def bulk_update_creator_status(self, status_by_id: Dict[str, str]) -> dict:
+        """
+        Apply status changes to many creators. Creators sharing a status are updated
+        with one filtered update, and all STATUS_CHANGED activities are written in a
+        single multi-row insert. Returns the updated creators and the IDs not found,
+        which includes IDs that are not valid UUIDs.
+        """
+        try:
+            now = datetime.now().isoformat()
+            ids_by_status: Dict[str, List[str]] = {}
+            for creator_id, new_status in status_by_id.items():
+                # A malformed ID would make Postgres reject the whole chunk it is in
+                if _is_uuid(creator_id):
+                    ids_by_status.setdefault(new_status, []).append(creator_id)
+
+            updated = []
+            for new_status, creator_ids in ids_by_status.items():
+                for start in range(0, len(creator_ids), BULK_UPDATE_CHUNK_SIZE):
+                    chunk = creator_ids[start:start + BULK_UPDATE_CHUNK_SIZE]
+                    result = self.supabase.table("creators").update({
+                        "status": new_status,
+                        "updated_at": now
+                    }).in_("id", chunk).execute()
+                    updated.extend(result.data or [])
+            self._write_through("creators", updated)
+
+            updated_ids = {str(creator["id"]) for creator in updated}
+            not_found = [creator_id for creator_id in status_by_id if str(creator_id) not in updated_ids]
+
+            activities = [
+                {
+                    "creator_id": creator["id"],
+                    "type": ActivityType.STATUS_CHANGED,
+                    "status": "completed",
+                    "metadata": {
+                        "body": f"Creator status changed to {creator['status']}"
+                    },
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for creator in updated
+            ]
+            if activities:
+                result = self.supabase.table("activities").insert(activities).execute()
+                self._write_through("activities", result.data or [])
+
+            return {"updated": updated, "not_found": not_found}
+        except Exception as e:
+            logger.error(f"Error bulk updating creator status: {str(e)}")
+            raise
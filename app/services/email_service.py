@@ -1,7 +1,7 @@
 import os
 from mailjet_rest import Client
 import logging
-from typing import Optional
+from typing import Optional, List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,7 @@ class EmailService:
         self.sender = os.environ["MAILJET_SENDER"]
         self.mailjet = Client(auth=(self.api_key, self.api_secret), version='v3.1')
 
-    async def send_email(
+    def _build_message(
         self,
         to_email: str,
         subject: str,
@@ -20,27 +20,85 @@ class EmailService:
         cc: Optional[str] = None,
         bcc: Optional[str] = None
     ) -> dict:
-        data = {
-            'Messages': [
-                {
-                    "From": {
-                        "Email": self.sender,
-                        "Name": "Your App"
-                    },
-                    "To": [{"Email": to_email}],
-                    "Subject": subject,
-                    "TextPart": body,
-                }
-            ]
+        message = {
+            "From": {
+                "Email": self.sender,
+                "Name": "Your App"
+            },
+            "To": [{"Email": to_email}],
+            "Subject": subject,
+            "TextPart": body,
         }
         if cc:
-            data['Messages'][0]['Cc'] = [{"Email": cc}]
+            message['Cc'] = [{"Email": cc}]
         if bcc:
-            data['Messages'][0]['Bcc'] = [{"Email": bcc}]
+            message['Bcc'] = [{"Email": bcc}]
+        return message
+
+    async def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        cc: Optional[str] = None,
+        bcc: Optional[str] = None
+    ) -> dict:
+        data = {
+            'Messages': [self._build_message(to_email, subject, body, cc=cc, bcc=bcc)]
+        }
         try:
+            # mailjet_rest returns the response whatever its status, so check it here
             result = self.mailjet.send.create(data=data)
-            logger.info(f"Mailjet response: {result.status_code} {result.json()}")
+            payload = self._payload(result)
+            logger.info(f"Mailjet response: {result.status_code} {payload}")
+            per_message = payload.get("Messages") if isinstance(payload, dict) else None
+            if per_message:
+                sent = per_message[0].get("Status") == "success"
+                detail = per_message[0].get("Errors") or per_message[0].get("To")
+            else:
+                sent = result.status_code < 300
+                detail = payload
+            if not sent:
+                logger.error(f"Mailjet rejected email to {to_email} ({result.status_code}): {detail}")
+                return {"status": "error", "mailjet_status": result.status_code, "detail": str(detail)}
             return {"status": "success", "mailjet_status": result.status_code}
         except Exception as e:
             logger.error(f"Mailjet error: {str(e)}")
-            return {"status": "error", "detail": str(e)} 
\ No newline at end of file
+            return {"status": "error", "detail": str(e)}
+
+    @staticmethod
+    def _payload(result) -> Any:
+        try:
+            return result.json()
+        except Exception:
+            return {}
+
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[dict]:
+        """
+        Send several messages (each with to_email, subject, body, cc, bcc) in one Mailjet
+        call. Returns one {"status", "detail"} result per message, in order; "error" means
+        Mailjet rejected that message. Transport errors and whole-request failures are
+        raised so the caller can retry.
+        """
+        data = {'Messages': [self._build_message(**message) for message in messages]}
+        result = self.mailjet.send.create(data=data)
+        payload = self._payload(result)
+        logger.info(f"Mailjet batch response: {result.status_code} for {len(messages)} messages")
+
+        per_message = payload.get("Messages") if isinstance(payload, dict) else None
+        if not per_message or len(per_message) != len(messages):
+            if result.status_code < 300:
+                return [{"status": "success", "detail": str(payload)} for _ in messages]
+            # A whole-request failure (bad credentials, suspended sender, outage) says
+            # nothing about the messages themselves, so raise to have them retried
+            if 400 <= result.status_code < 500 and result.status_code != 429:
+                logger.error(f"Mailjet rejected the whole batch ({result.status_code}), check the account: {payload}")
+            raise Exception(f"Mailjet returned {result.status_code}")
+
+        return [
+            {
+                "status": "success" if item.get("Status") == "success" else "error",
+                "detail": item.get("Errors") or item.get("To")
+            }
+            for item in per_message
+        ]
@@ -0,0 +1,224 @@
+import io
+import csv
+import json
+import zlib
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Iterator, Iterable
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TABLES = ("creators", "activities")
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+EXPORT_PAGE_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def iter_table_pages(
+    supabase,
+    table: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    activity_types: Optional[Iterable[str]] = None,
+    page_size: int = EXPORT_PAGE_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield pages of rows ordered by (created_at, id), the same columns the date range
+    filters on, using the last row of each page as the cursor for the next (keyset
+    pagination), so every page is an indexed range scan. Rows sharing the cursor's
+    timestamp are drained by id before later timestamps are read. Without a date range,
+    rows with no created_at follow at the end, paged by id.
+    """
+    def filtered():
+        query = supabase.table(table).select("*")
+        if start is not None:
+            query = query.gte("created_at", start.isoformat())
+        if end is not None:
+            query = query.lt("created_at", end.isoformat())
+        if activity_types and table == "activities":
+            query = query.in_("type", [getattr(t, "value", t) for t in activity_types])
+        return query
+
+    def next_page(cursor):
+        if cursor is not None:
+            rows = filtered().eq("created_at", cursor[0]).gt("id", cursor[1]) \
+                .order("id").limit(page_size).execute().data or []
+            if rows:
+                return rows
+        query = filtered().not_.is_("created_at", "null")
+        if cursor is not None:
+            query = query.gt("created_at", cursor[0])
+        return query.order("created_at").order("id").limit(page_size).execute().data or []
+
+    cursor = None
+    while True:
+        rows = next_page(cursor)
+        if not rows:
+            break
+        yield rows
+        cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+    if start is not None or end is not None:
+        return
+    last_id = None
+    while True:
+        query = filtered().is_("created_at", "null")
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data or []
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def _flatten(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _csv_chunks(
+    pages: Iterator[List[Dict[str, Any]]],
+    empty_columns: Callable[[], List[str]] = list
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = None
+    for rows in pages:
+        if writer is None:
+            # Columns come from the first row; later unknown keys are dropped
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerows({key: _flatten(value) for key, value in row.items()} for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is None:
+        # No matching rows: still send the header so the file is a valid, empty CSV
+        csv.writer(buffer).writerow(empty_columns())
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(pages: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in pages:
+        yield "".join(json.dumps(row, default=str) + "\n" for row in rows).encode("utf-8")
+
+
+class _ChunkSink:
+    """Write-only file object that collects bytes so they can be streamed out."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _table_columns(supabase, table: str) -> List[str]:
+    """Column names of a table, taken from any one row (empty if the table is)."""
+    rows = supabase.table(table).select("*").limit(1).execute().data or []
+    return list(rows[0].keys()) if rows else []
+
+
+def _parquet_chunks(
+    pages: Iterator[List[Dict[str, Any]]],
+    compression: Optional[str],
+    empty_columns: Callable[[], List[str]] = list
+) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    schema = None
+
+    def open_writer(columns: List[str]):
+        nonlocal schema, writer
+        # Values are written as strings (nested JSON encoded) so the schema cannot
+        # drift between pages, e.g. a column that is null throughout the first page
+        schema = pa.schema([(column, pa.string()) for column in columns])
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression=compression or "snappy")
+
+    try:
+        for rows in pages:
+            if writer is None:
+                open_writer(list(rows[0].keys()))
+            columns = {
+                column: [None if row.get(column) is None else str(_flatten(row.get(column))) for row in rows]
+                for column in schema.names
+            }
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+        if writer is None:
+            # No matching rows: still produce a readable file carrying the table's columns
+            open_writer(empty_columns())
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.drain()
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(
+    supabase,
+    table: str,
+    export_format: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    activity_types: Optional[Iterable[str]] = None,
+    compression: Optional[str] = None
+) -> Iterator[bytes]:
+    """
+    Stream a table export as bytes, one page at a time, so memory stays constant
+    regardless of export size. `compression="gzip"` gzips CSV/NDJSON output and
+    selects the gzip codec inside Parquet files.
+    """
+    pages = iter_table_pages(supabase, table, start=start, end=end, activity_types=activity_types)
+    if export_format == "parquet":
+        return _parquet_chunks(pages, compression, lambda: _table_columns(supabase, table))
+    if export_format == "csv":
+        chunks = _csv_chunks(pages, lambda: _table_columns(supabase, table))
+    else:
+        chunks = _ndjson_chunks(pages)
+    return _gzip(chunks) if compression == "gzip" else chunks
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
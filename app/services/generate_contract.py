@@ -1,11 +1,19 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from contextvars import ContextVar
 import os
+import time
+import asyncio
 import httpx
 from fastapi import HTTPException
 import logging
 from groq import Groq
 from dotenv import load_dotenv
 from app import db
+from app.services.replica_service import get_replica, ReplicaStaleError
+from app.services.contract_templates import assemble_contract
+from app.services.prompt_compaction import compact_conversations, estimate_tokens
+from app.services.model_router import ModelRouter
+from app.schemas.contract import ContractTerms
 import sys
 import traceback
 import json
@@ -36,6 +44,60 @@ except Exception as e:
 # Define the current Groq model to use
 GROQ_MODEL = "llama3-70b-8192"  # Updated to a currently supported model
 
+# Model routing table, smallest/fastest first. A route is preferred for prompts up to
+# `max_prompt_tokens` (null = no limit) and is only eligible when the prompt plus the
+# requested completion fits in `context_window`. Override with GROQ_MODEL_ROUTES (JSON).
+DEFAULT_MODEL_ROUTES = [
+    {"model": "llama3-8b-8192", "max_prompt_tokens": 1500, "context_window": 8192},
+    {"model": GROQ_MODEL, "max_prompt_tokens": None, "context_window": 8192},
+    {"model": "mixtral-8x7b-32768", "max_prompt_tokens": None, "context_window": 32768},
+]
+
+# Model that served the current request, for reporting back to the caller
+served_model: ContextVar[Optional[str]] = ContextVar("served_model", default=None)
+
+
+def _load_model_routes() -> List[Dict[str, Any]]:
+    routes = os.getenv("GROQ_MODEL_ROUTES")
+    if not routes:
+        return DEFAULT_MODEL_ROUTES
+    try:
+        return json.loads(routes)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid GROQ_MODEL_ROUTES, using defaults: {str(e)}")
+        return DEFAULT_MODEL_ROUTES
+
+
+model_router = ModelRouter(
+    _load_model_routes(),
+    max_error_rate=float(os.getenv("GROQ_MAX_ERROR_RATE", "0.5")),
+    latency_budget=float(os.getenv("GROQ_LATENCY_BUDGET_SECONDS", "30")),
+    max_attempts=int(os.getenv("GROQ_MAX_ATTEMPTS", "2")),
+    probe_interval=float(os.getenv("GROQ_PROBE_INTERVAL_SECONDS", "60"))
+)
+
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "60"))
+
+# Strip quoted replies, signatures and repeated paragraphs before building prompts
+PROMPT_COMPACTION_ENABLED = os.getenv("PROMPT_COMPACTION_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# "llm" asks the model to write the whole contract; "template" asks it only for the
+# variable terms as JSON and assembles the document from the clause library
+CONTRACT_GENERATION_MODES = ("llm", "template")
+DEFAULT_CONTRACT_GENERATION_MODE = os.getenv("CONTRACT_GENERATION_MODE", "llm")
+
+TERM_EXTRACTION_SYSTEM_PROMPT = (
+    "You extract contract terms from email conversations between an agency and a creator. "
+    "Respond with a single JSON object and nothing else, using exactly this shape: "
+    '{"parties": {"agency_name": str|null, "agency_representative": str|null, '
+    '"creator_name": str|null, "creator_handle": str|null}, '
+    '"scope": [str], '
+    '"compensation": {"amount": str|null, "currency": str|null, "payment_terms": str|null}, '
+    '"timeline": {"start_date": str|null, "end_date": str|null, "milestones": [str]}, '
+    '"special_terms": [str]}. '
+    "Use null or [] for anything not stated in the conversations. Keep each item short."
+)
+
 class ContractGenerationService:
     def __init__(self):
         try:
@@ -47,6 +109,45 @@ class ContractGenerationService:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> Tuple[str, str]:
+        """
+        Run a chat completion on the routed model, failing over to the next candidate
+        on errors or timeouts. Returns (content, model). The Groq client is blocking,
+        so each attempt runs in a worker thread to keep the event loop free.
+        """
+        prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        candidates = model_router.candidates(prompt_tokens, max_tokens)
+        last_error: Optional[Exception] = None
+
+        for model in candidates:
+            logger.info(f"Sending request to Groq API using model: {model} (~{prompt_tokens} prompt tokens)")
+            started = time.perf_counter()
+            try:
+                completion = await asyncio.to_thread(
+                    self.groq_client.chat.completions.create,
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=GROQ_TIMEOUT_SECONDS
+                )
+            except Exception as e:
+                model_router.record(model, time.perf_counter() - started, error=True)
+                logger.warning(f"Groq model {model} failed: {str(e)}")
+                last_error = e
+                continue
+
+            model_router.record(model, time.perf_counter() - started, error=False)
+            served_model.set(model)
+            return completion.choices[0].message.content, model
+
+        raise last_error or Exception("No Groq model available")
+
     async def get_conversation_data(self, creator_id: str) -> List[Dict[Any, Any]]:
         try:
             logger.info(f"Fetching conversations for creator_id: {creator_id}")
@@ -60,23 +161,15 @@ class ContractGenerationService:
                 raise HTTPException(status_code=400, detail=f"Invalid creator_id format: {creator_id}")
             
             # Fetch all email conversations from activities table for the creator
-            logger.debug(f"Executing Supabase query for activities where type='Email'")
-            result = db.supabase_client.table('activities') \
-                .select('*') \
-                .eq('type', 'Email') \
-                .order('created_at', desc=True) \
-                .execute()
-            
-            # Log the result for debugging
-            logger.debug(f"Supabase query result count: {len(result.data) if result.data else 0}")
+            activities = self._fetch_email_activities()
             
-            if not result.data:
+            if not activities:
                 logger.warning(f"No conversations found for creator_id: {creator_id}")
                 raise HTTPException(status_code=404, detail="No conversations found for this creator")
             
             # Filter and process the conversations
             conversations = []
-            for activity in result.data:
+            for activity in activities:
                 try:
                     metadata = activity.get('metadata', {})
                     logger.debug(f"Processing activity metadata: {json.dumps(metadata) if metadata else 'None'}")
@@ -111,6 +204,28 @@ class ContractGenerationService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise HTTPException(status_code=500, detail=error_msg)
 
+    def _fetch_email_activities(self) -> List[Dict[Any, Any]]:
+        """Fetch email activities, newest first, from the replica when it is fresh."""
+        replica = get_replica()
+        if replica is not None:
+            try:
+                activities = replica.get_activities(activity_type='Email')
+                logger.debug(f"Replica query result count: {len(activities)}")
+                return activities
+            except ReplicaStaleError as e:
+                logger.warning(f"Replica stale, reading activities from Supabase: {str(e)}")
+
+        logger.debug(f"Executing Supabase query for activities where type='Email'")
+        result = db.supabase_client.table('activities') \
+            .select('*') \
+            .eq('type', 'Email') \
+            .order('created_at', desc=True) \
+            .execute()
+        
+        # Log the result for debugging
+        logger.debug(f"Supabase query result count: {len(result.data) if result.data else 0}")
+        return result.data or []
+
     async def generate_contract_text(self, conversations: List[Dict[Any, Any]]) -> str:
         try:
             logger.info("Generating contract using Groq API")
@@ -121,12 +236,8 @@ class ContractGenerationService:
             # Log the conversations data for debugging
             logger.debug(f"Number of conversations for prompt: {len(conversations)}")
             
-            # Use the Groq client directly
-            logger.info(f"Sending request to Groq API using model: {GROQ_MODEL}")
-            
             try:
-                completion = self.groq_client.chat.completions.create(
-                    model=GROQ_MODEL,  # Use the updated model
+                contract_text, model = await self._complete(
                     messages=[
                         {
                             "role": "system", 
@@ -138,8 +249,7 @@ class ContractGenerationService:
                     max_tokens=4000
                 )
                 
-                logger.info("Received response from Groq API")
-                contract_text = completion.choices[0].message.content
+                logger.info(f"Received response from Groq API (model: {model})")
                 
                 if not contract_text:
                     logger.error("Empty contract text received from Groq API")
@@ -161,27 +271,80 @@ class ContractGenerationService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise HTTPException(status_code=500, detail=error_msg)
 
-    def _prepare_contract_prompt(self, conversations: List[Dict[Any, Any]]) -> str:
+    async def extract_contract_terms(self, conversations: List[Dict[Any, Any]]) -> ContractTerms:
+        """Ask the LLM only for the variable contract terms as compact JSON."""
         try:
-            # Create a chronological summary of the conversations
-            conversation_entries = []
+            logger.info("Extracting contract terms using Groq API")
+            prompt = self._prepare_extraction_prompt(conversations)
             
-            for conv in sorted(conversations, key=lambda x: x['timestamp']):
-                try:
-                    entry = (
-                        f"Timestamp: {conv.get('timestamp', 'N/A')}\n"
-                        f"To: {conv.get('to', 'N/A')}\n"
-                        f"Status: {conv.get('status', 'N/A')}\n"
-                        f"Message: {conv.get('body', 'N/A')}"
-                    )
-                    conversation_entries.append(entry)
-                except Exception as e:
-                    logger.error(f"Error formatting conversation entry: {str(e)}")
-                    continue
-            
-            conversation_summary = "\n\n".join(conversation_entries)
+            try:
+                raw_terms, model = await self._complete(
+                    messages=[
+                        {"role": "system", "content": TERM_EXTRACTION_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0,
+                    max_tokens=800
+                )
+            except Exception as groq_error:
+                logger.error(f"Groq API error: {str(groq_error)}")
+                raise HTTPException(status_code=500, detail=f"Groq API error: {str(groq_error)}")
             
-            logger.debug(f"Prepared prompt with {len(conversation_entries)} conversation entries")
+            raw_terms = raw_terms or ""
+            logger.info(f"Received contract terms from Groq API (model: {model})")
+            logger.debug(f"Extracted terms length: {len(raw_terms)} characters")
+            return self._parse_contract_terms(raw_terms)
+        except HTTPException as he:
+            logger.error(f"HTTP exception in extract_contract_terms: {he.detail}")
+            raise he
+        except Exception as e:
+            error_msg = f"Error extracting contract terms: {str(e)}"
+            logger.error(error_msg)
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            raise HTTPException(status_code=500, detail=error_msg)
+
+    @staticmethod
+    def _parse_contract_terms(raw_terms: str) -> ContractTerms:
+        """Parse the JSON object out of the model response, tolerating code fences or stray text."""
+        start = raw_terms.find("{")
+        end = raw_terms.rfind("}")
+        if start == -1 or end <= start:
+            raise ValueError("No JSON object found in term extraction response")
+        return ContractTerms.model_validate(json.loads(raw_terms[start:end + 1]))
+
+    async def generate_contract_from_template(self, conversations: List[Dict[Any, Any]]) -> str:
+        terms = await self.extract_contract_terms(conversations)
+        contract_text = assemble_contract(terms)
+        logger.info("Successfully assembled contract from template")
+        return contract_text
+
+    def _format_conversation_history(self, conversations: List[Dict[Any, Any]]) -> str:
+        # Create a chronological summary of the conversations
+        conversation_entries = []
+        
+        for conv in sorted(conversations, key=lambda x: x['timestamp']):
+            try:
+                entry = (
+                    f"Timestamp: {conv.get('timestamp', 'N/A')}\n"
+                    f"To: {conv.get('to', 'N/A')}\n"
+                    f"Status: {conv.get('status', 'N/A')}\n"
+                    f"Message: {conv.get('body', 'N/A')}"
+                )
+                conversation_entries.append(entry)
+            except Exception as e:
+                logger.error(f"Error formatting conversation entry: {str(e)}")
+                continue
+        
+        logger.debug(f"Prepared prompt with {len(conversation_entries)} conversation entries")
+        return "\n\n".join(conversation_entries)
+
+    def _prepare_extraction_prompt(self, conversations: List[Dict[Any, Any]]) -> str:
+        conversation_summary = self._format_conversation_history(conversations)
+        return f"CONVERSATION HISTORY:\n{conversation_summary}\n\nReturn the contract terms JSON."
+
+    def _prepare_contract_prompt(self, conversations: List[Dict[Any, Any]]) -> str:
+        try:
+            conversation_summary = self._format_conversation_history(conversations)
             
             return f"""
             Based on the following email conversations between the agency and the creator, generate a formal contract.
@@ -205,19 +368,36 @@ class ContractGenerationService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return "Error preparing contract prompt. Please check logs for details."
 
-async def generate_contract_for_creator(creator_id: str) -> str:
+async def generate_contract_for_creator(creator_id: str, mode: Optional[str] = None) -> str:
     """
-    Main function to generate contract for a creator based on all their email conversations
+    Main function to generate contract for a creator based on all their email conversations.
+    `mode` is "llm" (full LLM drafting) or "template" (LLM term extraction plus clause
+    templates) and defaults to the CONTRACT_GENERATION_MODE environment variable.
     """
     try:
-        logger.info(f"Starting contract generation process for creator_id: {creator_id}")
+        mode = mode or DEFAULT_CONTRACT_GENERATION_MODE
+        if mode not in CONTRACT_GENERATION_MODES:
+            raise ValueError(f"Unknown contract generation mode: {mode}")
+        
+        logger.info(f"Starting contract generation process for creator_id: {creator_id} (mode={mode})")
         service = ContractGenerationService()
         
         # Step 1: Fetch all email conversations
         conversations = await service.get_conversation_data(creator_id)
         
-        # Step 2: Generate contract using LLM based on all conversations
-        contract_text = await service.generate_contract_text(conversations)
+        # Step 2: Compact the conversation history to cut prompt tokens
+        if PROMPT_COMPACTION_ENABLED:
+            conversations, metrics = compact_conversations(conversations)
+            logger.info(
+                f"Compacted {metrics['messages']} conversations for creator_id {creator_id}: "
+                f"~{metrics['tokens_before']} -> ~{metrics['tokens_after']} tokens"
+            )
+        
+        # Step 3: Generate contract based on all conversations
+        if mode == "template":
+            contract_text = await service.generate_contract_from_template(conversations)
+        else:
+            contract_text = await service.generate_contract_text(conversations)
         
         logger.info(f"Completed contract generation for creator_id: {creator_id}")
         return contract_text
@@ -229,19 +409,3 @@ async def generate_contract_for_creator(creator_id: str) -> str:
             status_code=500, 
             detail=f"Failed to generate contract: {str(e)}"
         )
-
-def test_groq_connection():
-    """Test function to verify Groq API connection"""
-    try:
-        logger.info("Testing Groq API connection...")
-        response = groq_client.chat.completions.create(
-            model=GROQ_MODEL,  # Use the updated model
-            messages=[{"role": "user", "content": "Hello, respond with 'API working'"}],
-            max_tokens=10
-        )
-        logger.info(f"Test successful: {response.choices[0].message.content}")
-        return True
-    except Exception as e:
-        logger.error(f"Test failed: {str(e)}")
-        logger.error(f"Full traceback: {traceback.format_exc()}")
-        return False 
\ No newline at end of file
@@ -0,0 +1,196 @@
+import os
+import time
+import asyncio
+import logging
+import requests
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"   # Reachable but unhappy (e.g. auth rejected)
+STATUS_DOWN = "down"
+STATUS_NOT_CONFIGURED = "not_configured"
+STATUS_PENDING = "pending"     # Not probed yet
+
+
+class NotConfigured(Exception):
+    """Raised by a check whose credentials are not set."""
+
+
+def _http_status(response: requests.Response) -> str:
+    if response.status_code < 400:
+        return STATUS_OK
+    if response.status_code < 500 and response.status_code != 429:
+        return STATUS_DEGRADED
+    return STATUS_DOWN
+
+
+def check_supabase(timeout: float) -> str:
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    if not url or not key:
+        raise NotConfigured()
+    response = requests.get(
+        f"{url.rstrip('/')}/rest/v1/creators",
+        params={"select": "id", "limit": 1},
+        headers={"apikey": key, "Authorization": f"Bearer {key}"},
+        timeout=timeout
+    )
+    return _http_status(response)
+
+
+def check_groq(timeout: float) -> str:
+    # Listing models is free; a chat completion would be billed
+    api_key = os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        raise NotConfigured()
+    response = requests.get(
+        "https://api.groq.com/openai/v1/models",
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=timeout
+    )
+    return _http_status(response)
+
+
+def check_mailjet(timeout: float) -> str:
+    api_key = os.environ.get("MAILJET_API_KEY")
+    api_secret = os.environ.get("MAILJET_API_SECRET")
+    if not api_key or not api_secret:
+        raise NotConfigured()
+    response = requests.get(
+        "https://api.mailjet.com/v3/REST/sender",
+        params={"Limit": 1},
+        auth=(api_key, api_secret),
+        timeout=timeout
+    )
+    return _http_status(response)
+
+
+def check_bland(timeout: float) -> str:
+    api_key = os.environ.get("BLAND_AI_API_KEY")
+    if not api_key:
+        raise NotConfigured()
+    response = requests.get(
+        "https://api.bland.ai/v1/calls",
+        params={"limit": 1},
+        headers={"Authorization": api_key},
+        timeout=timeout
+    )
+    return _http_status(response)
+
+
+DEFAULT_CHECKS: Dict[str, Callable[[float], str]] = {
+    "supabase": check_supabase,
+    "groq": check_groq,
+    "mailjet": check_mailjet,
+    "bland": check_bland,
+}
+
+
+class HealthProber:
+    """
+    Probes each upstream dependency on a fixed interval with a cheap, non-billable call
+    and caches the outcome, so health endpoints answer from memory without touching
+    the network.
+    """
+
+    def __init__(
+        self,
+        checks: Optional[Dict[str, Callable[[float], str]]] = None,
+        interval: float = 30.0,
+        timeout: float = 5.0,
+        critical: Iterable[str] = ("supabase",)
+    ):
+        self.checks = checks or DEFAULT_CHECKS
+        self.interval = interval
+        self.timeout = timeout
+        self.critical = set(critical)
+        self.started_at = time.time()
+        self._task: Optional[asyncio.Task] = None
+        self._results: Dict[str, Dict[str, Any]] = {
+            name: {"status": STATUS_PENDING, "latency_ms": None, "checked_at": None, "error": None}
+            for name in self.checks
+        }
+
+    async def _probe(self, name: str, check: Callable[[float], str]) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            status = await asyncio.wait_for(asyncio.to_thread(check, self.timeout), self.timeout + 1)
+        except NotConfigured:
+            status = STATUS_NOT_CONFIGURED
+        except Exception as e:
+            status = STATUS_DOWN
+            error = str(e) or type(e).__name__
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        if status != self._results[name]["status"]:
+            logger.info(f"Health of {name} changed to {status}")
+        self._results[name] = {
+            "status": status,
+            "latency_ms": None if status == STATUS_NOT_CONFIGURED else latency_ms,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "checked_at_ts": time.time(),
+            "error": error
+        }
+
+    async def probe_all(self) -> None:
+        await asyncio.gather(*(self._probe(name, check) for name, check in self.checks.items()))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Health prober error: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Health prober started (interval={self.interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def result(self, name: str) -> Dict[str, Any]:
+        """Cached result for one dependency, with its age in seconds."""
+        result = dict(self._results[name])
+        checked_at_ts = result.pop("checked_at_ts", None)
+        result["age_seconds"] = round(time.time() - checked_at_ts, 1) if checked_at_ts else None
+        # A result more than a few intervals old means the prober itself has stalled
+        if result["age_seconds"] is not None and result["age_seconds"] > self.interval * 3:
+            result["stale"] = True
+        return result
+
+    def readiness(self) -> Dict[str, Any]:
+        dependencies = {name: self.result(name) for name in self.checks}
+        ready = all(
+            dependencies[name]["status"] == STATUS_OK and not dependencies[name].get("stale")
+            for name in self.critical if name in dependencies
+        )
+        return {"ready": ready, "dependencies": dependencies}
+
+
+_health_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    global _health_prober
+    if _health_prober is None:
+        _health_prober = HealthProber(
+            interval=float(os.environ.get("HEALTH_CHECK_INTERVAL_SECONDS", "30")),
+            timeout=float(os.environ.get("HEALTH_CHECK_TIMEOUT_SECONDS", "5")),
+            critical=[
+                name.strip() for name in os.environ.get("HEALTH_CRITICAL_CHECKS", "supabase").split(",")
+                if name.strip()
+            ]
+        )
+    return _health_prober
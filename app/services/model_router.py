@@ -0,0 +1,98 @@
+import time
+import threading
+from typing import Dict, Any, List
+
+
+class ModelRouter:
+    """
+    Picks a Groq model per request from the routing table using the prompt size and
+    the observed latency and error rate of each model, and provides the failover order.
+
+    A model over the error or latency limit is demoted behind the healthy ones. Once
+    `probe_interval` seconds pass without it being tried, it is offered in its normal
+    position for one request; a successful probe resets its stats, a failed one keeps
+    it demoted for another interval.
+    """
+
+    def __init__(
+        self,
+        routes: List[Dict[str, Any]],
+        max_error_rate: float = 0.5,
+        latency_budget: float = 30.0,
+        max_attempts: int = 2,
+        smoothing: float = 0.2,
+        probe_interval: float = 60.0,
+        clock=time.monotonic
+    ):
+        self.routes = routes
+        self.max_error_rate = max_error_rate
+        self.latency_budget = latency_budget
+        self.max_attempts = max_attempts
+        self.smoothing = smoothing
+        self.probe_interval = probe_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {route["model"]: self._new_stats() for route in routes}
+
+    @staticmethod
+    def _new_stats() -> Dict[str, float]:
+        return {"requests": 0, "errors": 0, "latency": 0.0, "error_rate": 0.0, "last_attempt_at": 0.0}
+
+    def _is_healthy(self, model: str) -> bool:
+        stats = self._stats[model]
+        if not stats["requests"]:
+            return True
+        return stats["error_rate"] <= self.max_error_rate and stats["latency"] <= self.latency_budget
+
+    def _take_probe(self, model: str, now: float) -> bool:
+        """Claim the probe slot for a demoted model if its interval has elapsed."""
+        stats = self._stats[model]
+        if now - stats["last_attempt_at"] < self.probe_interval:
+            return False
+        stats["last_attempt_at"] = now
+        return True
+
+    def candidates(self, prompt_tokens: int, max_tokens: int) -> List[str]:
+        """Models to try in order: the preferred route for this size first, unhealthy models last."""
+        eligible = [
+            route for route in self.routes
+            if prompt_tokens + max_tokens <= route["context_window"]
+        ]
+        if not eligible:
+            # Nothing fits; the largest context window is the best remaining chance
+            eligible = [max(self.routes, key=lambda route: route["context_window"])]
+
+        preferred = next(
+            (index for index, route in enumerate(eligible)
+             if route.get("max_prompt_tokens") is None or prompt_tokens <= route["max_prompt_tokens"]),
+            len(eligible) - 1
+        )
+        ordered = [route["model"] for route in eligible[preferred:] + eligible[:preferred]]
+
+        now = self.clock()
+        with self._lock:
+            healthy = [
+                model for model in ordered
+                if self._is_healthy(model) or self._take_probe(model, now)
+            ]
+            unhealthy = [model for model in ordered if model not in healthy]
+        return (healthy + unhealthy)[:self.max_attempts]
+
+    def record(self, model: str, latency: float, error: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(model, self._new_stats())
+            alpha = self.smoothing
+            if stats["requests"] and (error or self._is_healthy(model)):
+                stats["latency"] = (1 - alpha) * stats["latency"] + alpha * latency
+                stats["error_rate"] = (1 - alpha) * stats["error_rate"] + alpha * float(error)
+            else:
+                # First sample, or a demoted model that just succeeded: start over from it
+                stats["latency"] = latency
+                stats["error_rate"] = float(error)
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["last_attempt_at"] = self.clock()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._stats.items()}
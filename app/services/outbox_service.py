@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutbox:
+    """
+    SQLite queue of outgoing emails. It is only durable when `db_path` is on
+    persistent storage of a long-running server process, since the dispatcher that
+    drains it runs as a background task of that process.
+
+    Messages move pending -> sending -> sent, or back to pending with exponential
+    backoff on failure, and to dead once `max_attempts` is reached. A message left
+    in `sending` longer than `lease_seconds` (e.g. the worker died) is reclaimed.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        max_attempts: int = 5,
+        base_backoff: float = 2.0,
+        lease_seconds: float = 120.0
+    ):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock:
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id TEXT PRIMARY KEY,
+                    creator_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    claimed_at REAL,
+                    last_error TEXT,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_outbox_status_next_attempt
+                    ON outbox (status, next_attempt_at);
+            """)
+
+    def enqueue(self, creator_id: str, message: Dict[str, Any], activity: Dict[str, Any]) -> str:
+        """
+        Queue a message for delivery. `message` holds the EmailService.send_batch fields;
+        `activity` is logged by the dispatcher once the delivery outcome is known.
+        """
+        message_id = str(uuid.uuid4())
+        payload = json.dumps({"message": message, "activity": activity}, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outbox (id, creator_id, payload, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (message_id, str(creator_id), payload, time.time(), datetime.now().isoformat())
+            )
+        return message_id
+
+    def claim_batch(self, limit: int) -> List[Dict[str, Any]]:
+        """Atomically mark up to `limit` due messages as sending and return them."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, creator_id, payload, attempts FROM outbox "
+                    "WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                    "OR (status = 'sending' AND claimed_at <= ?) "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, now - self.lease_seconds, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                    [(now, row["id"]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            dict(json.loads(row["payload"]), id=row["id"], creator_id=row["creator_id"], attempts=row["attempts"])
+            for row in rows
+        ]
+
+    def mark_sent(self, message_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = 'sent', attempts = attempts + 1, last_error = NULL WHERE id = ?",
+                (message_id,)
+            )
+
+    def mark_failed(self, message_id: str, error: str, permanent: bool = False) -> bool:
+        """
+        Record a failed attempt and schedule a retry, or dead-letter the message if it
+        is out of attempts or the failure is permanent. Returns True if dead-lettered.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM outbox WHERE id = ?", (message_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            attempts = row["attempts"] + 1
+            dead = permanent or attempts >= self.max_attempts
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                (
+                    "dead" if dead else "pending",
+                    attempts,
+                    error,
+                    time.time() + self.base_backoff * (2 ** (attempts - 1)),
+                    message_id
+                )
+            )
+        return dead
+
+    def get_message(self, message_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, creator_id, status, attempts, last_error, created_at FROM outbox WHERE id = ?",
+                (message_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS count FROM outbox GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+
+class EmailDispatcher:
+    """Background task that drains the outbox in batches and logs each delivery outcome."""
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        email_service,
+        creator_service,
+        batch_size: int = 50,
+        poll_interval: float = 1.0
+    ):
+        self.outbox = outbox
+        self.email_service = email_service
+        self.creator_service = creator_service
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _log_outcome(self, item: Dict[str, Any], status: str, detail: Any = None) -> None:
+        activity = dict(item["activity"])
+        activity["status"] = status
+        activity["metadata"] = dict(activity.get("metadata") or {}, outbox_message_id=item["id"])
+        if detail is not None and status != "completed":
+            activity["metadata"]["error"] = str(detail)
+        activity["updated_at"] = datetime.now().isoformat()
+        try:
+            await self.creator_service.log_activity(activity)
+        except Exception as e:
+            logger.error(f"Failed to log email activity for outbox message {item['id']}: {str(e)}")
+
+    async def dispatch_once(self) -> int:
+        """Send one batch. Returns the number of messages processed."""
+        batch = await asyncio.to_thread(self.outbox.claim_batch, self.batch_size)
+        if not batch:
+            return 0
+
+        try:
+            results = await asyncio.to_thread(
+                self.email_service.send_batch, [item["message"] for item in batch]
+            )
+        except Exception as e:
+            logger.warning(f"Email batch of {len(batch)} failed, will retry: {str(e)}")
+            results = [{"status": "retry", "detail": str(e)} for _ in batch]
+
+        for item, result in zip(batch, results):
+            if result["status"] == "success":
+                self.outbox.mark_sent(item["id"])
+                await self._log_outcome(item, "completed")
+                continue
+
+            # Rejections by Mailjet are final; transport errors are retried until dead-lettered
+            dead = self.outbox.mark_failed(
+                item["id"], str(result.get("detail")), permanent=result["status"] == "error"
+            )
+            if dead:
+                logger.error(f"Outbox message {item['id']} dead-lettered: {result.get('detail')}")
+                await self._log_outcome(item, "failed", result.get("detail"))
+
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Email dispatcher error: {str(e)}")
+                processed = 0
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info("Email dispatcher started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_outbox: Optional[EmailOutbox] = None
+
+
+def outbox_enabled() -> bool:
+    return os.environ.get("EMAIL_OUTBOX_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def _check_outbox_db_path(db_path: str) -> None:
+    # Serverless functions have a read-only or ephemeral filesystem and don't keep
+    # background tasks running between invocations, so queued mail could be lost
+    if os.environ.get("VERCEL"):
+        raise RuntimeError(
+            "EMAIL_OUTBOX_ENABLED requires a long-running server process (e.g. uvicorn); "
+            "it is not supported on Vercel serverless functions"
+        )
+    existing = db_path if os.path.exists(db_path) else os.path.dirname(os.path.abspath(db_path))
+    if not os.access(existing, os.W_OK):
+        raise RuntimeError(f"EMAIL_OUTBOX_DB_PATH {db_path} is not writable")
+
+
+def get_outbox() -> Optional[EmailOutbox]:
+    """
+    Return the process-wide outbox, or None when outbox mode is off. Raises
+    RuntimeError when the outbox can't be kept (unwritable path, serverless host).
+    """
+    global _outbox
+    if not outbox_enabled():
+        return None
+    if _outbox is None:
+        db_path = os.environ.get("EMAIL_OUTBOX_DB_PATH", "email_outbox.sqlite3")
+        _check_outbox_db_path(db_path)
+        _outbox = EmailOutbox(
+            db_path=db_path,
+            max_attempts=int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+        )
+    return _outbox
@@ -0,0 +1,151 @@
+import re
+import hashlib
+import logging
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lines that start a quoted copy of an earlier message; everything from here on is dropped
+QUOTE_HEADER_PATTERNS = [
+    re.compile(r"^\s*On .{0,200}wrote:\s*$", re.IGNORECASE),
+    re.compile(r"^\s*-{2,}\s*Original Message\s*-{2,}\s*$", re.IGNORECASE),
+    re.compile(r"^\s*-{2,}\s*Forwarded message\s*-{2,}\s*$", re.IGNORECASE),
+    re.compile(r"^\s*_{10,}\s*$"),
+]
+
+# Outlook-style quote headers: a "From:" line immediately followed by "Sent:" or "Date:"
+FROM_HEADER_PATTERN = re.compile(r"^\s*From:\s.+$", re.IGNORECASE)
+SENT_HEADER_PATTERN = re.compile(r"^\s*(Sent|Date):\s.+$", re.IGNORECASE)
+
+# Lines that unambiguously start a signature block near the end of a message
+SIGNATURE_PATTERNS = [
+    re.compile(r"^--\s*$"),
+    re.compile(r"^\s*Sent from my \w+", re.IGNORECASE),
+]
+
+# Sign-offs also appear mid-message ("Thanks,\nWe can do $500..."), so they only start
+# a signature when everything after them looks like name/title/contact lines
+SIGN_OFF_PATTERNS = [
+    re.compile(r"^\s*(Best|Kind|Warm)?\s*regards,?\s*$", re.IGNORECASE),
+    re.compile(r"^\s*(Best|Thanks|Thank you|Cheers|Sincerely),?\s*$", re.IGNORECASE),
+]
+
+# Longest line (in words) still treated as a name/title line after a sign-off
+SIGNATURE_LINE_MAX_WORDS = 6
+
+# Paragraphs that are legal/confidentiality boilerplate rather than negotiation content
+DISCLAIMER_PATTERN = re.compile(
+    r"(this (e-?mail|message)( and any attachments)? (is|are|may be) (confidential|intended)"
+    r"|intended (solely|only) for the (use of the )?(individual|addressee|recipient)"
+    r"|if you (are not|have received this).{0,40}(intended recipient|in error)"
+    r"|please consider the environment before printing)",
+    re.IGNORECASE
+)
+
+# A signature block is only stripped if it starts within this many lines of the end
+SIGNATURE_MAX_LINES = 8
+
+# Repeated paragraphs shorter than this are kept: short replies such as "Yes, agreed."
+# recur legitimately and the latest one can carry the negotiated outcome
+MIN_DEDUP_TOKENS = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def strip_quoted_reply(body: str) -> str:
+    """Remove quoted reply chains: '>' lines and anything after an 'On ... wrote:' style header."""
+    kept = []
+    lines = body.splitlines()
+    for index, line in enumerate(lines):
+        is_header = any(pattern.match(line) for pattern in QUOTE_HEADER_PATTERNS) or (
+            FROM_HEADER_PATTERN.match(line)
+            and index + 1 < len(lines)
+            and SENT_HEADER_PATTERN.match(lines[index + 1])
+        )
+        if is_header:
+            # Only treat a header as a quote marker if there is content above it
+            if any(existing.strip() for existing in kept):
+                break
+        if line.lstrip().startswith(">"):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _is_signature_line(line: str) -> bool:
+    """Whether a line after a sign-off looks like a name, title or contact detail."""
+    text = line.strip()
+    if not text:
+        return True
+    words = text.split()
+    if len(words) > SIGNATURE_LINE_MAX_WORDS or re.search(r"[$€£]", text):
+        return False
+    # Sentences and clauses end in punctuation; names, titles and "Acme Inc." don't
+    return not text.endswith((",", ";", ":", "?", "!")) and not (text.endswith(".") and len(words) > 2)
+
+
+def strip_signature(body: str) -> str:
+    """Remove a trailing signature block and confidentiality disclaimers."""
+    lines = body.splitlines()
+    for index in range(max(0, len(lines) - SIGNATURE_MAX_LINES), len(lines)):
+        if index == 0:
+            continue
+        line = lines[index]
+        if any(pattern.match(line) for pattern in SIGNATURE_PATTERNS) or (
+            any(pattern.match(line) for pattern in SIGN_OFF_PATTERNS)
+            and all(_is_signature_line(rest) for rest in lines[index + 1:])
+        ):
+            lines = lines[:index]
+            break
+
+    paragraphs = re.split(r"\n\s*\n", "\n".join(lines))
+    paragraphs = [p for p in paragraphs if not DISCLAIMER_PATTERN.search(p)]
+    return "\n\n".join(paragraphs).strip()
+
+
+def _paragraph_key(paragraph: str) -> str:
+    normalized = re.sub(r"\s+", " ", paragraph).strip().lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def compact_conversations(conversations: List[Dict[Any, Any]]) -> Tuple[List[Dict[Any, Any]], Dict[str, int]]:
+    """
+    Strip quoted replies, signatures and disclaimers from each message body and drop
+    paragraphs of at least MIN_DEDUP_TOKENS already seen in an earlier message. Messages are processed oldest first
+    so the first occurrence of repeated text is the one kept. Returns the compacted
+    conversations (same order as given) and token metrics.
+    """
+    tokens_before = sum(estimate_tokens(conv.get('body') or '') for conv in conversations)
+    seen = set()
+    compacted: Dict[int, Dict[Any, Any]] = {}
+
+    ordered = sorted(enumerate(conversations), key=lambda item: item[1].get('timestamp') or '')
+    for position, conv in ordered:
+        body = conv.get('body') or ''
+        body = strip_signature(strip_quoted_reply(body))
+
+        paragraphs = []
+        for paragraph in re.split(r"\n\s*\n", body):
+            if not paragraph.strip():
+                continue
+            if estimate_tokens(paragraph.strip()) >= MIN_DEDUP_TOKENS:
+                key = _paragraph_key(paragraph)
+                if key in seen:
+                    continue
+                seen.add(key)
+            paragraphs.append(paragraph.strip())
+
+        compacted[position] = dict(conv, body="\n\n".join(paragraphs))
+
+    result = [compacted[position] for position in range(len(conversations))]
+    tokens_after = sum(estimate_tokens(conv['body']) for conv in result)
+    metrics = {
+        "messages": len(conversations),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+    }
+    return result, metrics
@@ -0,0 +1,429 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tables mirrored from Supabase into the local replica
+REPLICATED_TABLES = ("creators", "activities")
+
+
+class ReplicaStaleError(Exception):
+    """Raised when the replica has not synced within its staleness bound."""
+
+
+class CreatorReplica:
+    """
+    Local SQLite read replica of the Supabase `creators` and `activities` tables.
+
+    Rows are pulled incrementally using per-table `updated_at` high-water marks
+    and stored as JSON alongside the columns we index on. Reads are answered
+    locally as long as the last successful sync is within `max_staleness`
+    seconds, so short Supabase outages keep serving the last known data.
+
+    `updated_at` is written by each client's clock rather than by the database,
+    so every sync re-reads `overlap` seconds behind the mark to pick up rows
+    written late by a client whose clock lags. Rows deleted in Supabase, and rows
+    with no `updated_at` at all, are only handled by the full reconciliation that
+    runs every `reconcile_interval` seconds, so they can be out of date for up to
+    that long.
+    """
+
+    def __init__(
+        self,
+        supabase,
+        db_path: str = ":memory:",
+        sync_interval: float = 5.0,
+        max_staleness: float = 300.0,
+        page_size: int = 1000,
+        overlap: float = 60.0,
+        reconcile_interval: float = 3600.0
+    ):
+        self.supabase = supabase
+        self.db_path = db_path
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.page_size = page_size
+        self.overlap = overlap
+        self.reconcile_interval = reconcile_interval
+        self.last_synced_at: Optional[float] = None
+        self.last_reconciled_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[str, List[Dict[str, Any]]], None]] = []
+        self._delete_listeners: List[Callable[[str, List[str]], None]] = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS creators (
+                    id TEXT PRIMARY KEY,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS activities (
+                    id TEXT PRIMARY KEY,
+                    creator_id TEXT,
+                    type TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_creators_created_at
+                    ON creators (created_at);
+                CREATE INDEX IF NOT EXISTS idx_activities_type_created_at
+                    ON activities (type, created_at);
+                CREATE INDEX IF NOT EXISTS idx_activities_creator_created_at
+                    ON activities (creator_id, created_at);
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    table_name TEXT PRIMARY KEY,
+                    high_water_mark TEXT
+                );
+            """)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _get_high_water_mark(self, table: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water_mark FROM sync_state WHERE table_name = ?", (table,)
+            ).fetchone()
+        return row["high_water_mark"] if row else None
+
+    def _set_high_water_mark(self, table: str, high_water_mark: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (table_name, high_water_mark) VALUES (?, ?) "
+                "ON CONFLICT(table_name) DO UPDATE SET high_water_mark = excluded.high_water_mark",
+                (table, high_water_mark)
+            )
+
+    def add_listener(self, listener: Callable[[str, List[Dict[str, Any]]], None]) -> None:
+        """Register a callback invoked with (table, rows) after rows are upserted."""
+        self._listeners.append(listener)
+
+    def add_delete_listener(self, listener: Callable[[str, List[str]], None]) -> None:
+        """Register a callback invoked with (table, ids) after rows are deleted."""
+        self._delete_listeners.append(listener)
+
+    def upsert_rows(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """Write rows into the replica, replacing any existing copy by ID."""
+        if table not in REPLICATED_TABLES:
+            raise ValueError(f"Table {table} is not replicated")
+        rows = [row for row in rows if row and row.get("id") is not None]
+        if not rows:
+            return
+
+        if table == "creators":
+            sql = (
+                "INSERT OR REPLACE INTO creators (id, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?)"
+            )
+            params = [
+                (str(row["id"]), row.get("created_at"), row.get("updated_at"), json.dumps(row, default=str))
+                for row in rows
+            ]
+        else:
+            sql = (
+                "INSERT OR REPLACE INTO activities (id, creator_id, type, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)"
+            )
+            params = [
+                (
+                    str(row["id"]),
+                    str(row.get("creator_id")) if row.get("creator_id") is not None else None,
+                    row.get("type"),
+                    row.get("created_at"),
+                    row.get("updated_at"),
+                    json.dumps(row, default=str)
+                )
+                for row in rows
+            ]
+
+        with self._lock, self._conn:
+            self._conn.executemany(sql, params)
+
+        for listener in self._listeners:
+            try:
+                listener(table, rows)
+            except Exception as e:
+                logger.warning(f"Replica listener failed: {str(e)}")
+
+    def _changed_rows(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop rows whose stored copy already has the same `updated_at`."""
+        ids = [str(row["id"]) for row in rows]
+        placeholders = ",".join("?" for _ in ids)
+        with self._lock:
+            stored = dict(self._conn.execute(
+                f"SELECT id, updated_at FROM {table} WHERE id IN ({placeholders})", ids
+            ).fetchall())
+        return [
+            row for row in rows
+            if str(row["id"]) not in stored or stored[str(row["id"])] != row.get("updated_at")
+        ]
+
+    def _overlap_start(self, high_water_mark: str) -> str:
+        try:
+            return (datetime.fromisoformat(high_water_mark) - timedelta(seconds=self.overlap)).isoformat()
+        except ValueError:
+            return high_water_mark
+
+    def _fetch_page(self, table: str, cursor: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Next page after `cursor` in (updated_at, id) order. Rows sharing the cursor's
+        timestamp are drained by id first, then rows with a later timestamp are read.
+        """
+        if cursor is not None:
+            rows = self.supabase.table(table).select("*") \
+                .eq("updated_at", cursor[0]) \
+                .gt("id", cursor[1]) \
+                .order("id") \
+                .limit(self.page_size) \
+                .execute().data or []
+            if rows:
+                return rows
+
+        # Rows without updated_at can't carry a cursor; sync_untimestamped picks them up
+        query = self.supabase.table(table).select("*").not_.is_("updated_at", "null")
+        if cursor is not None:
+            query = query.gt("updated_at", cursor[0])
+        return query.order("updated_at").order("id").limit(self.page_size).execute().data or []
+
+    def sync_table(self, table: str) -> int:
+        """
+        Pull rows changed since the table's high-water mark, paging by keyset on
+        (updated_at, id). Returns the number of new or changed rows.
+        """
+        high_water_mark = self._get_high_water_mark(table)
+        new_high_water_mark = high_water_mark
+        # Start just before the overlap window; "" sorts before every real id
+        cursor = (self._overlap_start(high_water_mark), "") if high_water_mark else None
+        synced = 0
+
+        while True:
+            rows = self._fetch_page(table, cursor)
+            if not rows:
+                break
+
+            changed = self._changed_rows(table, rows)
+            self.upsert_rows(table, changed)
+            synced += len(changed)
+
+            last = rows[-1]
+            cursor = (last.get("updated_at"), str(last["id"]))
+            if cursor[0] and (not new_high_water_mark or cursor[0] > new_high_water_mark):
+                new_high_water_mark = cursor[0]
+
+        if new_high_water_mark and new_high_water_mark != high_water_mark:
+            self._set_high_water_mark(table, new_high_water_mark)
+
+        return synced
+
+    def sync_untimestamped(self, table: str) -> int:
+        """
+        Pull rows with a null `updated_at` (e.g. activities ingested by other writers),
+        which the incremental sync cannot page over. Returns the number of new or changed rows.
+        """
+        synced = 0
+        last_id = None
+        while True:
+            query = self.supabase.table(table).select("*").is_("updated_at", "null")
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.order("id").limit(self.page_size).execute().data or []
+            if not rows:
+                break
+            changed = self._changed_rows(table, rows)
+            self.upsert_rows(table, changed)
+            synced += len(changed)
+            last_id = rows[-1]["id"]
+        return synced
+
+    def reconcile_deletes(self, table: str) -> int:
+        """Remove local rows whose IDs no longer exist in Supabase. Returns the count removed."""
+        remote_ids = set()
+        last_id = None
+        while True:
+            query = self.supabase.table(table).select("id")
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.order("id").limit(self.page_size).execute().data or []
+            if not rows:
+                break
+            remote_ids.update(str(row["id"]) for row in rows)
+            last_id = rows[-1]["id"]
+
+        with self._lock:
+            local_ids = [row["id"] for row in self._conn.execute(f"SELECT id FROM {table}").fetchall()]
+        deleted = [row_id for row_id in local_ids if row_id not in remote_ids]
+        if deleted:
+            with self._lock, self._conn:
+                self._conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for row_id in deleted])
+            for listener in self._delete_listeners:
+                try:
+                    listener(table, deleted)
+                except Exception as e:
+                    logger.warning(f"Replica delete listener failed: {str(e)}")
+        return len(deleted)
+
+    def sync(self) -> Dict[str, int]:
+        """Run one incremental sync pass over all replicated tables."""
+        counts = {table: self.sync_table(table) for table in REPLICATED_TABLES}
+        now = time.monotonic()
+        if self.last_reconciled_at is None or now - self.last_reconciled_at >= self.reconcile_interval:
+            for table in REPLICATED_TABLES:
+                counts[table] += self.sync_untimestamped(table)
+            deleted = {table: self.reconcile_deletes(table) for table in REPLICATED_TABLES}
+            self.last_reconciled_at = now
+            if any(deleted.values()):
+                logger.info(f"Replica reconciliation removed {deleted}")
+        self.last_synced_at = now
+        if any(counts.values()):
+            logger.info(f"Replica sync pulled {counts}")
+        return counts
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logger.warning(f"Replica sync failed, serving last known data: {str(e)}")
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self) -> None:
+        """Start the background sync loop on the running event loop."""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync_loop())
+            logger.info(f"Replica sync started (interval={self.sync_interval}s, max_staleness={self.max_staleness}s)")
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def iter_rows(self, table: str, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every locally stored row of a table, regardless of staleness. Rows are
+        read in batches keyed on id, so memory stays bounded and the connection lock
+        is only held per batch rather than while the caller consumes rows.
+        """
+        if table not in REPLICATED_TABLES:
+            raise ValueError(f"Table {table} is not replicated")
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield json.loads(row["data"])
+            last_id = rows[-1]["id"]
+
+    @property
+    def staleness(self) -> Optional[float]:
+        """Seconds since the last successful sync, or None if never synced."""
+        if self.last_synced_at is None:
+            return None
+        return time.monotonic() - self.last_synced_at
+
+    def is_fresh(self) -> bool:
+        staleness = self.staleness
+        return staleness is not None and staleness <= self.max_staleness
+
+    def _ensure_fresh(self) -> None:
+        if not self.is_fresh():
+            raise ReplicaStaleError(f"Replica staleness {self.staleness} exceeds {self.max_staleness}s")
+
+    def get_creator(self, creator_id: str) -> Optional[dict]:
+        self._ensure_fresh()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM creators WHERE id = ?", (str(creator_id),)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_all_creators(self) -> List[dict]:
+        self._ensure_fresh()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM creators ORDER BY created_at, id"
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_activities(
+        self,
+        activity_type: Optional[str] = None,
+        creator_id: Optional[str] = None,
+        newest_first: bool = True
+    ) -> List[dict]:
+        self._ensure_fresh()
+        clauses, params = [], []
+        if activity_type is not None:
+            clauses.append("type = ?")
+            params.append(activity_type)
+        if creator_id is not None:
+            clauses.append("creator_id = ?")
+            params.append(str(creator_id))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM activities {where} ORDER BY created_at {order}", params
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+
+_replica: Optional[CreatorReplica] = None
+
+
+def replica_enabled() -> bool:
+    return os.environ.get("REPLICA_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_replica(supabase=None) -> Optional[CreatorReplica]:
+    """
+    Return the process-wide replica, creating it on first use when
+    REPLICA_ENABLED is set. Returns None when replica mode is off.
+    """
+    global _replica
+    if not replica_enabled():
+        return None
+    if _replica is None:
+        if supabase is None:
+            from supabase import create_client
+            supabase = create_client(
+                supabase_url=os.environ.get("SUPABASE_URL"),
+                supabase_key=os.environ.get("SUPABASE_KEY")
+            )
+        _replica = CreatorReplica(
+            supabase,
+            db_path=os.environ.get("REPLICA_DB_PATH", "replica.sqlite3"),
+            sync_interval=float(os.environ.get("REPLICA_SYNC_INTERVAL_SECONDS", "5")),
+            max_staleness=float(os.environ.get("REPLICA_MAX_STALENESS_SECONDS", "300")),
+            overlap=float(os.environ.get("REPLICA_SYNC_OVERLAP_SECONDS", "60")),
+            reconcile_interval=float(os.environ.get("REPLICA_RECONCILE_INTERVAL_SECONDS", "3600"))
+        )
+    return _replica
@@ -0,0 +1,348 @@
+import os
+import re
+import math
+import heapq
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Weight applied to a term reached by prefix expansion rather than an exact match
+PREFIX_MATCH_WEIGHT = 0.5
+
+# Maximum number of vocabulary terms a single query prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+
+# Most documents scored per query. Candidates are taken from the most selective
+# query token in descending impact order, so a token present in most documents
+# costs this much rather than its full posting list
+MAX_CANDIDATES = 2000
+
+# Postings are grouped into this many impact buckets per term. Candidate order only
+# has to be approximately right; exact BM25 scores are computed for the candidates
+IMPACT_BUCKETS = 32
+
+# Typical document length used when bucketing postings by impact
+IMPACT_REFERENCE_LENGTH = 40.0
+
+SNIPPET_LENGTH = 160
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over creator names/handles and activity bodies.
+
+    Documents are keyed by ("creator", id) or ("activity", id). Indexing a key
+    that already exists replaces its postings, so the index can be fed the same
+    row repeatedly (e.g. from replica syncs) and stay consistent. Queries match
+    every query token either exactly or as a prefix, and are ranked with BM25.
+
+    Each term's postings are grouped into buckets by impact (how much the document's
+    tf and length contribute to its score), so queries score the strongest
+    MAX_CANDIDATES matches of their most selective token instead of every posting.
+    Results are exact whenever that token matches no more than MAX_CANDIDATES
+    documents.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # term -> impact bucket -> keys (dict used as an insertion-ordered set)
+        self._postings: Dict[str, Dict[int, Dict[Tuple[str, str], None]]] = defaultdict(dict)
+        self._terms: List[str] = []
+        self._doc_terms: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._doc_lengths: Dict[Tuple[str, str], int] = {}
+        self._doc_fields: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # creator_id -> keys of the creator and its activities, for creator-scoped queries
+        self._creator_docs: Dict[str, Dict[Tuple[str, str], None]] = defaultdict(dict)
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _impact_norm(length: int) -> float:
+        return BM25_K1 * (1 - BM25_B + BM25_B * length / IMPACT_REFERENCE_LENGTH)
+
+    def _add_document(self, key: Tuple[str, str], tokens: List[str], fields: Dict[str, Any]) -> None:
+        self._remove_document(key)
+
+        term_counts: Dict[str, int] = defaultdict(int)
+        for token in tokens:
+            term_counts[token] += 1
+
+        # tf / (tf + norm) is below 1, so bucket indexes stay below IMPACT_BUCKETS
+        norm = self._impact_norm(len(tokens))
+        for term, count in term_counts.items():
+            buckets = self._postings[term]
+            if not buckets:
+                bisect.insort(self._terms, term)
+            bucket_index = int(count * IMPACT_BUCKETS / (count + norm))
+            bucket = buckets.get(bucket_index)
+            if bucket is None:
+                bucket = buckets[bucket_index] = {}
+            bucket[key] = None
+
+        self._doc_terms[key] = dict(term_counts)
+        self._doc_lengths[key] = len(tokens)
+        self._doc_fields[key] = fields
+        if fields.get("creator_id") is not None:
+            self._creator_docs[fields["creator_id"]][key] = None
+        self._total_length += len(tokens)
+
+    def _remove_document(self, key: Tuple[str, str]) -> None:
+        term_counts = self._doc_terms.pop(key, None)
+        if term_counts is None:
+            return
+        norm = self._impact_norm(self._doc_lengths.get(key, 0))
+        for term, count in term_counts.items():
+            buckets = self._postings.get(term)
+            if buckets is None:
+                continue
+            bucket_index = int(count * IMPACT_BUCKETS / (count + norm))
+            buckets[bucket_index].pop(key, None)
+            if not buckets[bucket_index]:
+                del buckets[bucket_index]
+            if not buckets:
+                del self._postings[term]
+                index = bisect.bisect_left(self._terms, term)
+                if index < len(self._terms) and self._terms[index] == term:
+                    self._terms.pop(index)
+        self._total_length -= self._doc_lengths.pop(key, 0)
+        fields = self._doc_fields.pop(key, None)
+        creator_docs = self._creator_docs.get(fields.get("creator_id")) if fields else None
+        if creator_docs is not None:
+            creator_docs.pop(key, None)
+            if not creator_docs:
+                del self._creator_docs[fields["creator_id"]]
+
+    def index_creator(self, creator: Dict[str, Any]) -> None:
+        if not creator or creator.get("id") is None:
+            return
+        name = creator.get("name") or ""
+        handle = creator.get("handle") or ""
+        tokens = tokenize(name) + tokenize(handle)
+        # Also index the handle as a single token so "johnd" prefix-matches "john_doe"
+        joined_handle = "".join(tokenize(handle))
+        if joined_handle and joined_handle not in tokens:
+            tokens.append(joined_handle)
+        fields = {
+            "kind": "creator",
+            "id": str(creator["id"]),
+            "creator_id": str(creator["id"]),
+            "type": None,
+            "created_at": creator.get("created_at"),
+            "name": name,
+            "handle": handle
+        }
+        with self._lock:
+            self._add_document(("creator", str(creator["id"])), tokens, fields)
+
+    def index_activity(self, activity: Dict[str, Any]) -> None:
+        if not activity or activity.get("id") is None:
+            return
+        metadata = activity.get("metadata") or {}
+        body = metadata.get("body", "") if isinstance(metadata, dict) else ""
+        activity_type = activity.get("type")
+        if hasattr(activity_type, "value"):
+            activity_type = activity_type.value
+        fields = {
+            "kind": "activity",
+            "id": str(activity["id"]),
+            "creator_id": str(activity["creator_id"]) if activity.get("creator_id") is not None else None,
+            "type": activity_type,
+            "created_at": activity.get("created_at"),
+            "snippet": (body or "")[:SNIPPET_LENGTH]
+        }
+        with self._lock:
+            self._add_document(("activity", str(activity["id"])), tokenize(body), fields)
+
+    def index_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Index rows from the `creators` or `activities` table."""
+        indexer = self.index_creator if table == "creators" else self.index_activity
+        for row in rows:
+            indexer(row)
+
+    def remove_rows(self, table: str, ids: Iterable[str]) -> None:
+        """Drop rows of the `creators` or `activities` table from the index by ID."""
+        kind = "creator" if table == "creators" else "activity"
+        with self._lock:
+            for row_id in ids:
+                self._remove_document((kind, str(row_id)))
+
+    def build_from_supabase(self, supabase, page_size: int = 1000) -> int:
+        """Populate the index by paging through both tables. Returns the document count."""
+        for table in ("creators", "activities"):
+            offset = 0
+            while True:
+                result = supabase.table(table).select("*") \
+                    .order("id") \
+                    .range(offset, offset + page_size - 1) \
+                    .execute()
+                rows = result.data or []
+                self.index_rows(table, rows)
+                offset += len(rows)
+                if len(rows) < page_size:
+                    break
+        logger.info(f"Search index built with {len(self)} documents")
+        return len(self)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Return (term, weight) pairs for an exact match plus the most common prefix matches."""
+        candidates = []
+        index = bisect.bisect_left(self._terms, token)
+        while index < len(self._terms) and self._terms[index].startswith(token):
+            candidates.append(self._terms[index])
+            index += 1
+
+        expansions = [term for term in candidates if term != token]
+        if len(expansions) > MAX_PREFIX_EXPANSIONS:
+            expansions = heapq.nlargest(
+                MAX_PREFIX_EXPANSIONS, expansions, key=self._df
+            )
+
+        weighted = [(term, PREFIX_MATCH_WEIGHT) for term in expansions]
+        if token in self._postings:
+            weighted.append((token, 1.0))
+        return weighted
+
+    def _df(self, term: str) -> int:
+        return sum(len(bucket) for bucket in self._postings[term].values())
+
+    def _idf(self, term: str, doc_count: int) -> float:
+        df = self._df(term)
+        return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+    def _top_candidates(
+        self,
+        weighted_terms: List[Tuple[str, float]],
+        allowed: Callable[[Tuple[str, str]], bool]
+    ) -> Dict[Tuple[str, str], None]:
+        """Up to MAX_CANDIDATES allowed documents matching any of the terms, strongest first."""
+        buckets = sorted(
+            ((term_weight * (bucket_index + 1), term, bucket_index)
+             for term, term_weight in weighted_terms
+             for bucket_index in self._postings[term]),
+            reverse=True
+        )
+        candidates: Dict[Tuple[str, str], None] = {}
+        for _, term, bucket_index in buckets:
+            for key in self._postings[term][bucket_index]:
+                if key not in candidates and allowed(key):
+                    candidates[key] = None
+                    if len(candidates) >= MAX_CANDIDATES:
+                        return candidates
+        return candidates
+
+    def search(
+        self,
+        query: str,
+        kinds: Optional[Iterable[str]] = None,
+        activity_types: Optional[Iterable[str]] = None,
+        creator_id: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the index. Every query token must match a document, either
+        exactly or as a prefix of an indexed term.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        kinds = set(kinds) if kinds else None
+        activity_types = {getattr(t, "value", t) for t in activity_types} if activity_types else None
+
+        def allowed(key: Tuple[str, str]) -> bool:
+            fields = self._doc_fields[key]
+            if kinds is not None and fields["kind"] not in kinds:
+                return False
+            if activity_types is not None and fields["type"] not in activity_types:
+                return False
+            if creator_id is not None and fields["creator_id"] != str(creator_id):
+                return False
+            return True
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if not doc_count:
+                return []
+            avg_length = (self._total_length / doc_count) or 1.0
+
+            # Expand each token; candidates come from the most selective one
+            expanded = [self._expand(token) for token in tokens]
+            if any(not terms for terms in expanded):
+                return []
+            expanded.sort(key=lambda terms: sum(self._df(t) for t, _ in terms))
+            weighted = [
+                [(term, weight * self._idf(term, doc_count) * (BM25_K1 + 1)) for term, weight in terms]
+                for terms in expanded
+            ]
+
+            creator_docs = self._creator_docs.get(str(creator_id)) if creator_id is not None else None
+            if creator_id is not None and not creator_docs:
+                return []
+            selective_postings = sum(self._df(term) for term, _ in weighted[0])
+            if creator_docs is not None and len(creator_docs) <= selective_postings:
+                # A creator's own documents are the smaller set; score them all
+                candidates = {key: None for key in creator_docs if allowed(key)}
+            else:
+                candidates = self._top_candidates(weighted[0], allowed)
+
+            scores: Dict[Tuple[str, str], float] = {}
+            for key in candidates:
+                doc_terms = self._doc_terms[key]
+                norm_length = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[key] / avg_length)
+                total = 0.0
+                for terms in weighted:
+                    best = 0.0
+                    for term, term_weight in terms:
+                        tf = doc_terms.get(term)
+                        if tf:
+                            best = max(best, term_weight * tf / (tf + norm_length))
+                    if not best:
+                        break
+                    total += best
+                else:
+                    scores[key] = total
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [dict(self._doc_fields[key], score=round(score, 4)) for key, score in top]
+
+
+_search_index: Optional[SearchIndex] = None
+
+
+def search_enabled() -> bool:
+    return os.environ.get("SEARCH_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """Return the process-wide search index, or None when search is disabled."""
+    global _search_index
+    if not search_enabled():
+        return None
+    if _search_index is None:
+        _search_index = SearchIndex()
+    return _search_index
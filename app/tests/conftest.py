@@ -0,0 +1,147 @@
+import os
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+# Modules that build API clients at import time need these set; no requests are made
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "header.payload.signature")  # Must look like a JWT
+
+
+class FakeQuery:
+    """Minimal PostgREST query builder over the dict rows held by a FakeSupabase."""
+
+    def __init__(self, supabase, table):
+        self.supabase = supabase
+        self.table = table
+        self.filters = []
+        self.in_values = []
+        self.orders = []
+        self.row_limit = None
+        self.row_range = None
+        self.values = None
+        self.inserted = None
+        self.negate = False
+
+    def _filter(self, predicate):
+        negate, self.negate = self.negate, False
+        self.filters.append((lambda row: not predicate(row)) if negate else predicate)
+        return self
+
+    def select(self, *args):
+        return self
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def eq(self, column, value):
+        # PostgREST rejects comparisons against a null literal (`eq.None`)
+        assert value is not None, f"eq.{value} on {column}"
+        return self._filter(lambda row: row[column] == value)
+
+    def is_(self, column, value):
+        return self._filter(lambda row: row.get(column) is None if value == "null" else row.get(column) == value)
+
+    def gt(self, column, value):
+        assert value is not None, f"gt.{value} on {column}"
+        return self._filter(lambda row: row[column] is not None and row[column] > value)
+
+    def gte(self, column, value):
+        return self._filter(lambda row: row[column] >= value)
+
+    def lt(self, column, value):
+        return self._filter(lambda row: row[column] < value)
+
+    def in_(self, column, values):
+        values = list(values)
+        self.in_values.append(values)
+        return self._filter(lambda row: row[column] in values)
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def range(self, start, end):
+        self.row_range = (start, end)
+        return self
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def insert(self, rows):
+        self.inserted = rows
+        return self
+
+    def execute(self):
+        self.supabase.queries.append(self)
+        source = self.supabase.tables.setdefault(self.table, [])
+        if self.inserted is not None:
+            source.extend(dict(row) for row in self.inserted)
+            return SimpleNamespace(data=[dict(row) for row in self.inserted])
+
+        rows = [row for row in source if all(f(row) for f in self.filters)]
+        if self.values is not None:
+            for row in rows:
+                row.update(self.values)
+        # Stable sorts applied last key first give multi-column ordering
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: (row[column] is None, row[column] or ""), reverse=desc)
+        if self.row_range is not None:
+            rows = rows[self.row_range[0]:self.row_range[1] + 1]
+        if self.row_limit is not None:
+            rows = rows[:self.row_limit]
+        if self.supabase.on_execute:
+            self.supabase.on_execute()
+        return SimpleNamespace(data=[dict(row) for row in rows])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = {"creators": [], "activities": []}
+        self.queries = []
+        self.on_execute = None
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def fake_supabase():
+    return FakeSupabase()
+
+
+async def _ok_app(scope, receive, send):
+    sum(range(1000))  # Give the profiler something to record
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _call(app, method="GET", path="/creators", headers=(), client="1.2.3.4"):
+    """Run one HTTP request through an ASGI app. Returns (status, headers dict)."""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers), "client": (client, 1234)}
+    asyncio.run(app(scope, None, send))
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+@pytest.fixture
+def ok_app():
+    return _ok_app
+
+
+@pytest.fixture
+def call():
+    return _call
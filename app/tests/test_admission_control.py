@@ -0,0 +1,61 @@
+import asyncio
+from app.middleware.admission_control import AdmissionControlMiddleware, ConcurrencyLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_llm_route_rate_limited_per_client(ok_app, call):
+    clock = Clock()
+    middleware = AdmissionControlMiddleware(ok_app, clock=clock)
+    statuses = [call(middleware, "POST", "/creators/abc/generate-contract")[0] for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+    assert call(middleware, "POST", "/creators/abc/generate-contract", client="5.6.7.8")[0] == 200
+    assert call(middleware, "GET", "/creators")[0] == 200
+
+    status, headers = call(middleware, "POST", "/creators/abc/generate-contract")
+    assert status == 429 and int(headers[b"retry-after"]) >= 1
+    clock.now += 10
+    assert call(middleware, "POST", "/creators/abc/generate-contract")[0] == 200
+
+
+def test_expensive_routes_shed_before_reads(ok_app, call):
+    middleware = AdmissionControlMiddleware(ok_app, max_in_flight=10)
+    middleware.in_flight = 7
+    assert call(middleware, "POST", "/creators/abc/call")[0] == 503
+    assert call(middleware, "GET", "/creators")[0] == 200
+
+
+def test_concurrency_limiter_queue_and_timeout():
+    async def scenario():
+        limiter = ConcurrencyLimiter(limit=1, max_queue=1)
+        assert await limiter.acquire(timeout=0.01)
+        waiter = asyncio.ensure_future(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        assert not await limiter.acquire(timeout=0.01)  # queue full
+        limiter.release()
+        assert await waiter
+        assert not await limiter.acquire(timeout=0.01)  # timed out waiting
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_forwarded_for_ignored_without_trusted_proxy(ok_app):
+    middleware = AdmissionControlMiddleware(ok_app)
+    scope = {"client": ("1.2.3.4", 1234), "headers": [(b"x-forwarded-for", b"9.9.9.9")]}
+    assert middleware.client_key(scope) == "1.2.3.4"
+
+
+def test_forwarded_for_honoured_behind_trusted_proxy(ok_app):
+    middleware = AdmissionControlMiddleware(ok_app, trusted_proxies=["10.0.0.0/8"])
+    scope = {"client": ("10.0.0.5", 1234), "headers": [(b"x-forwarded-for", b"6.6.6.6, 9.9.9.9, 10.0.0.7")]}
+    # The left-most entry is client-supplied; the nearest untrusted hop is the real client
+    assert middleware.client_key(scope) == "9.9.9.9"
+    assert middleware.client_key({"client": ("10.0.0.5", 1234), "headers": []}) == "10.0.0.5"
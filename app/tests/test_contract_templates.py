@@ -0,0 +1,40 @@
+from app.schemas.contract import ContractTerms
+from app.services.contract_templates import assemble_contract
+
+
+def test_assemble_contract_fills_extracted_terms():
+    terms = ContractTerms.model_validate({
+        "parties": {"agency_name": "Acme Media", "creator_name": "Jane Doe", "creator_handle": "@janedoe"},
+        "scope": ["2 Instagram reels", "1 TikTok video"],
+        "compensation": {"amount": "1,500", "currency": "USD", "payment_terms": "50% upfront"},
+        "timeline": {"start_date": "2024-03-01", "end_date": "2024-03-31", "milestones": []},
+        "special_terms": ["Exclusivity in the fitness category for 30 days"],
+    })
+    contract = assemble_contract(terms)
+    assert "Acme Media" in contract
+    assert "Jane Doe (@janedoe)" in contract
+    assert "- 2 Instagram reels" in contract
+    assert "1,500 USD" in contract
+    assert "Exclusivity in the fitness category" in contract
+    assert contract.index("1. PARTIES") < contract.index("7. SIGNATURES")
+
+
+def test_assemble_contract_is_deterministic_with_defaults():
+    terms = ContractTerms()
+    assert assemble_contract(terms) == assemble_contract(ContractTerms())
+    assert "e) The Parties additionally agree" not in assemble_contract(terms)
+
+
+def test_extracted_terms_tolerate_numbers_and_nulls():
+    terms = ContractTerms.model_validate({
+        "parties": None,
+        "scope": ["3 reels", 2, None],
+        "compensation": {"amount": 500, "currency": "USD", "payment_terms": None},
+        "timeline": {"start_date": None, "milestones": None},
+        "special_terms": None
+    })
+    assert terms.scope == ["3 reels", "2"]
+    assert terms.compensation.amount == "500"
+    assert terms.timeline.milestones == []
+    assert terms.special_terms == []
+    assert terms.parties.creator_name is None
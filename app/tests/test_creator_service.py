@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from app.services.creator_service import CreatorService
+
+C1 = "00000000-0000-0000-0000-000000000001"
+C2 = "00000000-0000-0000-0000-000000000002"
+MISSING = "00000000-0000-0000-0000-0000000000ff"
+
+
+@pytest.fixture
+def supabase(fake_supabase):
+    fake_supabase.tables["creators"] = [{"id": C1, "status": "new"}, {"id": C2, "status": "new"}]
+    return fake_supabase
+
+
+def updated_ids(supabase):
+    return [query.in_values[0] for query in supabase.queries if query.values is not None]
+
+
+def test_single_status_is_one_update(supabase):
+    result = asyncio.run(CreatorService(supabase).bulk_update_creator_status({C1: "contacted", C2: "contacted"}))
+    assert updated_ids(supabase) == [[C1, C2]]
+    assert {creator["status"] for creator in result["updated"]} == {"contacted"}
+    assert len(supabase.tables["activities"]) == 2
+
+
+def test_per_id_statuses_are_applied(supabase):
+    asyncio.run(CreatorService(supabase).bulk_update_creator_status({C1: "contacted", C2: "signed"}))
+    assert {row["id"]: row["status"] for row in supabase.tables["creators"]} == {C1: "contacted", C2: "signed"}
+
+
+def test_missing_and_malformed_ids_are_not_found(supabase):
+    result = asyncio.run(CreatorService(supabase).bulk_update_creator_status(
+        {C1: "contacted", MISSING: "contacted", "not-a-uuid": "contacted"}
+    ))
+    assert [creator["id"] for creator in result["updated"]] == [C1]
+    assert result["not_found"] == [MISSING, "not-a-uuid"]
+    # Postgres rejects a whole `in` filter containing a malformed UUID
+    assert updated_ids(supabase) == [[C1, MISSING]]
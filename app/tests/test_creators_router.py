@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import creators
+from app.dependencies import get_creator_service
+from app.services.email_service import EmailService
+
+
+class FakeCreatorService:
+    def __init__(self):
+        self.activities = []
+
+    async def get_creator(self, creator_id):
+        return {"id": creator_id, "name": "Jane", "handle": "jane", "email": "jane@example.com"}
+
+    async def log_activity(self, activity):
+        self.activities.append(activity)
+        return activity
+
+
+def make_client(status_code, payload):
+    email_service = EmailService.__new__(EmailService)
+    email_service.sender = "agency@example.com"
+    response = SimpleNamespace(status_code=status_code, json=lambda: payload)
+    email_service.mailjet = SimpleNamespace(send=SimpleNamespace(create=lambda data: response))
+
+    creator_service = FakeCreatorService()
+    app = FastAPI()
+    app.include_router(creators.router)
+    app.dependency_overrides[get_creator_service] = lambda: creator_service
+    app.dependency_overrides[EmailService] = lambda: email_service
+    return TestClient(app), creator_service
+
+
+EMAIL = {"subject": "Offer", "body": "Hi Jane"}
+
+
+def test_rejected_email_is_logged_as_failed(monkeypatch):
+    monkeypatch.setenv("EMAIL_OUTBOX_ENABLED", "false")
+    client, creator_service = make_client(401, {"ErrorMessage": "API key authentication failure"})
+    response = client.post("/creators/c1/email", json=EMAIL)
+    assert response.status_code == 502
+    assert [activity["status"] for activity in creator_service.activities] == ["failed"]
+
+
+def test_sent_email_is_logged_as_completed(monkeypatch):
+    monkeypatch.setenv("EMAIL_OUTBOX_ENABLED", "false")
+    client, creator_service = make_client(200, {"Messages": [{"Status": "success", "To": []}]})
+    response = client.post("/creators/c1/email", json=EMAIL)
+    assert response.status_code == 200
+    assert [activity["status"] for activity in creator_service.activities] == ["completed"]
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.services.email_service import EmailService
+
+
+def make_service(status_code, payload):
+    service = EmailService.__new__(EmailService)
+    service.sender = "agency@example.com"
+    response = SimpleNamespace(status_code=status_code, json=lambda: payload)
+    service.mailjet = SimpleNamespace(send=SimpleNamespace(create=lambda data: response))
+    return service
+
+
+MESSAGES = [
+    {"to_email": "a@example.com", "subject": "Offer", "body": "Hi"},
+    {"to_email": "b@example.com", "subject": "Offer", "body": "Hi"},
+]
+
+
+def test_per_message_rejections_are_errors():
+    service = make_service(400, {"Messages": [
+        {"Status": "success", "To": [{"Email": "a@example.com"}]},
+        {"Status": "error", "Errors": [{"ErrorMessage": "Invalid email"}]},
+    ]})
+    assert [result["status"] for result in service.send_batch(MESSAGES)] == ["success", "error"]
+
+
+@pytest.mark.parametrize("status_code", [401, 403, 429, 500])
+def test_whole_request_failures_are_raised_for_retry(status_code):
+    service = make_service(status_code, {"ErrorMessage": "API key authentication failure"})
+    with pytest.raises(Exception):
+        service.send_batch(MESSAGES)
+
+
+def test_send_email_reports_whole_request_rejection():
+    service = make_service(401, {"ErrorMessage": "API key authentication failure"})
+    result = asyncio.run(service.send_email("a@example.com", "Offer", "Hi"))
+    assert result["status"] == "error" and result["mailjet_status"] == 401
+
+
+def test_send_email_reports_per_message_rejection():
+    service = make_service(400, {"Messages": [{"Status": "error", "Errors": [{"ErrorMessage": "Invalid email"}]}]})
+    assert asyncio.run(service.send_email("a@example.com", "Offer", "Hi"))["status"] == "error"
+
+
+def test_send_email_success():
+    service = make_service(200, {"Messages": [{"Status": "success", "To": [{"Email": "a@example.com"}]}]})
+    assert asyncio.run(service.send_email("a@example.com", "Offer", "Hi"))["status"] == "success"
@@ -0,0 +1,74 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime
+from app.services.export_service import stream_export, iter_table_pages
+
+
+ACTIVITIES = [
+    {"id": f"{i:03d}", "type": "email_sent" if i % 2 else "call_made",
+     "created_at": f"2024-01-{i % 28 + 1:02d}T00:00:00", "metadata": {"body": f"message {i}"}}
+    for i in range(25)
+]
+# Export order is (created_at, id)
+EXPORT_ORDER = [row["id"] for row in sorted(ACTIVITIES, key=lambda row: (row["created_at"], row["id"]))]
+
+
+@pytest.fixture
+def supabase(fake_supabase):
+    fake_supabase.tables["activities"] = [dict(row) for row in ACTIVITIES]
+    return fake_supabase
+
+
+def test_keyset_pages_cover_all_rows_once(supabase):
+    pages = list(iter_table_pages(supabase, "activities", page_size=10))
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [row["id"] for page in pages for row in page] == EXPORT_ORDER
+
+
+def test_keyset_pages_drain_shared_timestamps_and_null_created_at(fake_supabase):
+    fake_supabase.tables["creators"] = [
+        {"id": f"{i:02d}", "created_at": "2024-01-01T00:00:00" if i < 7 else None}
+        for i in range(10)
+    ] + [{"id": "00b", "created_at": "2023-12-31T00:00:00"}]
+    pages = list(iter_table_pages(fake_supabase, "creators", page_size=3))
+    ids = [row["id"] for page in pages for row in page]
+    assert ids == ["00b"] + [f"{i:02d}" for i in range(10)]
+
+
+def test_date_range_is_paged_on_created_at(supabase):
+    pages = list(iter_table_pages(
+        supabase, "activities", start=datetime(2024, 1, 5), end=datetime(2024, 1, 10), page_size=2
+    ))
+    ids = [row["id"] for page in pages for row in page]
+    expected = [row["id"] for row in ACTIVITIES if "2024-01-05" <= row["created_at"] < "2024-01-10"]
+    assert ids == [i for i in EXPORT_ORDER if i in expected]
+
+
+def test_csv_export_with_type_filter(supabase):
+    data = b"".join(stream_export(supabase, "activities", "csv", activity_types=["call_made"]))
+    rows = list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+    assert len(rows) == 13
+    assert {row["type"] for row in rows} == {"call_made"}
+    assert json.loads(rows[0]["metadata"]) == {"body": "message 0"}
+
+
+def test_gzipped_ndjson_export(supabase):
+    data = b"".join(stream_export(supabase, "activities", "ndjson", compression="gzip"))
+    lines = gzip.decompress(data).decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == EXPORT_ORDER
+
+
+def test_empty_parquet_export_is_a_valid_file(supabase):
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(stream_export(supabase, "activities", "parquet", activity_types=["status_changed"]))
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 0
+    assert table.column_names == ["id", "type", "created_at", "metadata"]
+
+
+def test_empty_csv_export_has_header(supabase):
+    data = b"".join(stream_export(supabase, "activities", "csv", activity_types=["status_changed"]))
+    assert data.decode("utf-8").splitlines() == ["id,type,created_at,metadata"]
@@ -0,0 +1,56 @@
+import time
+import asyncio
+from types import SimpleNamespace
+from app.services import generate_contract
+from app.services.model_router import ModelRouter
+
+
+class BlockingCompletions:
+    """Blocking stand-in for the Groq client; fails for the listed models."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.models = []
+
+    def create(self, model, **kwargs):
+        self.models.append(model)
+        time.sleep(0.05)
+        if model in self.failing:
+            raise TimeoutError(f"{model} timed out")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"from {model}"))])
+
+
+def make_service(monkeypatch, completions):
+    routes = [
+        {"model": "small", "max_prompt_tokens": None, "context_window": 8192},
+        {"model": "large", "max_prompt_tokens": None, "context_window": 32768},
+    ]
+    monkeypatch.setattr(generate_contract, "model_router", ModelRouter(routes))
+    service = generate_contract.ContractGenerationService()
+    service.groq_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+def test_complete_fails_over_without_blocking_the_event_loop(monkeypatch):
+    completions = BlockingCompletions(failing=["small"])
+    service = make_service(monkeypatch, completions)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        result = await service._complete([{"role": "user", "content": "hi"}], temperature=0, max_tokens=10)
+        task.cancel()
+        return result, ticks
+
+    (content, model), ticks = asyncio.run(scenario())
+    assert (content, model) == ("from large", "large")
+    assert completions.models == ["small", "large"]
+    # The loop kept running other coroutines while the blocking calls were in flight
+    assert ticks >= 5
@@ -0,0 +1,39 @@
+import asyncio
+from app.services.health_service import HealthProber, NotConfigured, STATUS_OK, STATUS_DOWN
+
+
+def ok_check(timeout):
+    return STATUS_OK
+
+
+def failing_check(timeout):
+    raise ConnectionError("unreachable")
+
+
+def unconfigured_check(timeout):
+    raise NotConfigured()
+
+
+def test_readiness_before_first_probe_is_not_ready():
+    prober = HealthProber(checks={"supabase": ok_check})
+    assert prober.readiness()["ready"] is False
+
+
+def test_readiness_depends_only_on_critical_checks():
+    prober = HealthProber(
+        checks={"supabase": ok_check, "bland": failing_check, "mailjet": unconfigured_check},
+        critical=["supabase"]
+    )
+    asyncio.run(prober.probe_all())
+    readiness = prober.readiness()
+    assert readiness["ready"] is True
+    assert readiness["dependencies"]["bland"]["status"] == STATUS_DOWN
+    assert readiness["dependencies"]["bland"]["error"] == "unreachable"
+    assert readiness["dependencies"]["mailjet"]["status"] == "not_configured"
+    assert readiness["dependencies"]["supabase"]["latency_ms"] is not None
+
+
+def test_critical_failure_makes_service_not_ready():
+    prober = HealthProber(checks={"supabase": failing_check})
+    asyncio.run(prober.probe_all())
+    assert prober.readiness()["ready"] is False
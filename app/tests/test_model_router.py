@@ -0,0 +1,87 @@
+from app.services.model_router import ModelRouter
+
+ROUTES = [
+    {"model": "small", "max_prompt_tokens": 1000, "context_window": 4000},
+    {"model": "medium", "max_prompt_tokens": None, "context_window": 4000},
+    {"model": "large", "max_prompt_tokens": None, "context_window": 32000},
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_router(**kwargs):
+    kwargs.setdefault("max_attempts", 3)
+    return ModelRouter(ROUTES, **kwargs)
+
+
+def test_small_prompts_prefer_the_smallest_model():
+    assert make_router().candidates(prompt_tokens=500, max_tokens=500) == ["small", "medium", "large"]
+
+
+def test_larger_prompts_skip_ahead_and_wrap_around():
+    assert make_router().candidates(prompt_tokens=2000, max_tokens=500) == ["medium", "large", "small"]
+
+
+def test_models_that_cannot_fit_are_excluded():
+    assert make_router().candidates(prompt_tokens=5000, max_tokens=500) == ["large"]
+    assert make_router().candidates(prompt_tokens=50000, max_tokens=500) == ["large"]
+
+
+def test_failover_list_is_capped_at_max_attempts():
+    assert make_router(max_attempts=2).candidates(prompt_tokens=500, max_tokens=500) == ["small", "medium"]
+
+
+def test_failing_model_is_demoted():
+    router = make_router()
+    router.record("small", latency=1.0, error=True)
+    assert router.candidates(prompt_tokens=500, max_tokens=500) == ["medium", "large", "small"]
+
+
+def test_slow_model_is_demoted():
+    router = make_router(latency_budget=5.0)
+    router.record("small", latency=10.0, error=False)
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "medium"
+
+
+def test_demoted_model_is_probed_and_recovers():
+    clock = Clock()
+    router = make_router(probe_interval=60.0, clock=clock)
+    router.record("small", latency=1.0, error=True)
+
+    clock.now = 30.0
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "medium"
+
+    clock.now = 61.0
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "small"
+    # Only one probe per interval while it is in flight
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "medium"
+
+    router.record("small", latency=1.0, error=False)
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "small"
+
+
+def test_failed_probe_keeps_model_demoted():
+    clock = Clock()
+    router = make_router(probe_interval=60.0, clock=clock)
+    router.record("small", latency=1.0, error=True)
+
+    clock.now = 61.0
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "small"
+    router.record("small", latency=1.0, error=True)
+    assert router.candidates(prompt_tokens=500, max_tokens=500)[0] == "medium"
+
+
+def test_stats_track_requests_and_errors():
+    router = make_router(smoothing=0.5)
+    router.record("small", latency=2.0, error=False)
+    router.record("small", latency=4.0, error=True)
+    stats = router.stats()["small"]
+    assert (stats["requests"], stats["errors"]) == (2, 1)
+    assert stats["latency"] == 3.0
+    assert stats["error_rate"] == 0.5
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from app.services import outbox_service
+from app.services.outbox_service import EmailOutbox, EmailDispatcher
+
+
+class FakeEmailService:
+    def __init__(self, results=None, error=None):
+        self.results = results
+        self.error = error
+        self.batches = []
+
+    def send_batch(self, messages):
+        self.batches.append(messages)
+        if self.error:
+            raise self.error
+        return self.results or [{"status": "success", "detail": None} for _ in messages]
+
+
+class FakeCreatorService:
+    def __init__(self):
+        self.activities = []
+
+    async def log_activity(self, activity_data):
+        self.activities.append(activity_data)
+        return activity_data
+
+
+def enqueue(outbox, count=1):
+    return [
+        outbox.enqueue("c1", {"to_email": "a@b.com", "subject": "Hi", "body": "Hello"},
+                       {"creator_id": "c1", "type": "email_sent", "metadata": {"body": "Hello"}})
+        for _ in range(count)
+    ]
+
+
+def test_dispatch_sends_batch_and_logs_completed():
+    outbox = EmailOutbox()
+    ids = enqueue(outbox, 3)
+    email_service, creator_service = FakeEmailService(), FakeCreatorService()
+    dispatcher = EmailDispatcher(outbox, email_service, creator_service)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 3
+    assert len(email_service.batches) == 1
+    assert [a["status"] for a in creator_service.activities] == ["completed"] * 3
+    assert all(outbox.get_message(message_id)["status"] == "sent" for message_id in ids)
+
+
+def test_transport_errors_retry_then_dead_letter():
+    outbox = EmailOutbox(max_attempts=2, base_backoff=0)
+    [message_id] = enqueue(outbox)
+    creator_service = FakeCreatorService()
+    dispatcher = EmailDispatcher(outbox, FakeEmailService(error=Exception("timeout")), creator_service)
+
+    asyncio.run(dispatcher.dispatch_once())
+    assert outbox.get_message(message_id)["status"] == "pending"
+    assert creator_service.activities == []
+
+    asyncio.run(dispatcher.dispatch_once())
+    assert outbox.get_message(message_id)["status"] == "dead"
+    assert creator_service.activities[0]["status"] == "failed"
+
+
+def test_rejected_message_is_dead_lettered_immediately():
+    outbox = EmailOutbox()
+    [message_id] = enqueue(outbox)
+    email_service = FakeEmailService(results=[{"status": "error", "detail": "invalid address"}])
+    creator_service = FakeCreatorService()
+
+    asyncio.run(EmailDispatcher(outbox, email_service, creator_service).dispatch_once())
+    assert outbox.get_message(message_id)["status"] == "dead"
+    assert creator_service.activities[0]["metadata"]["error"] == "invalid address"
+
+
+def test_get_outbox_fails_on_unwritable_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(outbox_service, "_outbox", None)
+    monkeypatch.setenv("EMAIL_OUTBOX_ENABLED", "true")
+    monkeypatch.setenv("EMAIL_OUTBOX_DB_PATH", str(tmp_path / "missing" / "outbox.sqlite3"))
+    monkeypatch.delenv("VERCEL", raising=False)
+    with pytest.raises(RuntimeError, match="not writable"):
+        outbox_service.get_outbox()
+
+
+def test_get_outbox_refuses_serverless_host(tmp_path, monkeypatch):
+    monkeypatch.setattr(outbox_service, "_outbox", None)
+    monkeypatch.setenv("EMAIL_OUTBOX_ENABLED", "true")
+    monkeypatch.setenv("EMAIL_OUTBOX_DB_PATH", str(tmp_path / "outbox.sqlite3"))
+    monkeypatch.setenv("VERCEL", "1")
+    with pytest.raises(RuntimeError, match="long-running"):
+        outbox_service.get_outbox()
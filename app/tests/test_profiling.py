@@ -0,0 +1,36 @@
+from app.middleware.profiling import ProfilingMiddleware, ProfileStore
+
+
+def response_headers(call, middleware, headers=(), path="/creators"):
+    return call(middleware, path=path, headers=headers)[1]
+
+
+def test_profiles_only_requests_with_valid_token(tmp_path, ok_app, call):
+    store = ProfileStore(str(tmp_path))
+    middleware = ProfilingMiddleware(ok_app, store, token="secret")
+
+    assert b"x-profile-id" not in response_headers(call, middleware)
+    assert b"x-profile-id" not in response_headers(call, middleware, [(b"x-profile", b"wrong")])
+
+    profile_id = response_headers(call, middleware, [(b"x-profile", b"secret")])[b"x-profile-id"].decode()
+    assert store.path(profile_id, "prof")
+    with open(store.path(profile_id, "txt")) as f:
+        assert f.readline().startswith("GET /creators took")
+    assert [profile["id"] for profile in store.list()] == [profile_id]
+
+
+def test_store_evicts_oldest_and_rejects_bad_ids(tmp_path, ok_app, call):
+    store = ProfileStore(str(tmp_path), max_profiles=1)
+    middleware = ProfilingMiddleware(ok_app, store, sample_rate=1.0)
+    call(middleware)
+    call(middleware)
+    assert len(store.list()) == 1
+    assert store.path("../etc/passwd", "txt") is None
+
+
+def test_profile_retrieval_is_not_profiled(tmp_path, ok_app, call):
+    store = ProfileStore(str(tmp_path))
+    middleware = ProfilingMiddleware(ok_app, store, token="secret", sample_rate=1.0)
+    assert b"x-profile-id" not in response_headers(call, middleware, [(b"x-profile", b"secret")], path="/profiles")
+    assert b"x-profile-id" not in response_headers(call, middleware, path="/profiles/abc/pstats")
+    assert store.list() == []
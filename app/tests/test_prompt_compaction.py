@@ -0,0 +1,49 @@
+from app.services.prompt_compaction import compact_conversations, strip_quoted_reply, strip_signature
+
+
+def test_strip_quoted_reply():
+    body = "Sounds good, $800 works.\n\nOn Mon, Mar 4, 2024 at 10:00 AM Agency <a@b.com> wrote:\n> Can you do $800?"
+    assert strip_quoted_reply(body).strip() == "Sounds good, $800 works."
+
+
+def test_from_line_without_sent_header_is_kept():
+    body = "Subject: Offer\nFrom: agency@example.com\nContent: 3 reels for $900"
+    assert strip_quoted_reply(body) == body
+
+
+def test_strip_signature_and_disclaimer():
+    body = (
+        "Deliverables: 2 reels by March 15.\n\n"
+        "This email and any attachments are confidential and intended solely for the addressee.\n\n"
+        "Best regards,\nJane\nTalent Manager"
+    )
+    assert strip_signature(body) == "Deliverables: 2 reels by March 15."
+
+
+def test_terms_after_sign_off_line_are_kept():
+    body = "Hi team,\nThanks,\nWe can do $500 for 3 reels,\ndelivered by March 1."
+    assert strip_signature(body) == body
+
+
+def test_sign_off_followed_by_contact_lines_is_stripped():
+    body = "Confirmed for 3 reels.\nThanks,\nJane Doe\nHead of Partnerships\n+1 555 010 2000"
+    assert strip_signature(body) == "Confirmed for 3 reels."
+
+
+def test_compact_conversations_dedupes_repeated_paragraphs():
+    repeated = "Please confirm the posting dates and send the brief for the first reel."
+    conversations = [
+        {"timestamp": "2024-03-02", "body": f"We agree to $500.\n\n{repeated}"},
+        {"timestamp": "2024-03-01", "body": repeated},
+    ]
+    compacted, metrics = compact_conversations(conversations)
+    assert compacted[0]["body"] == "We agree to $500."
+    assert compacted[1]["body"] == repeated
+    assert metrics["tokens_after"] < metrics["tokens_before"]
+
+
+def test_short_repeated_replies_are_kept():
+    bodies = ["Can you do $400 for 3 reels?", "Yes, agreed.", "Actually we need 5 reels for $600.", "Yes, agreed."]
+    conversations = [{"timestamp": f"2024-03-0{i + 1}", "body": body} for i, body in enumerate(bodies)]
+    compacted, _ = compact_conversations(conversations)
+    assert [conv["body"] for conv in compacted] == bodies
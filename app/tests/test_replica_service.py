@@ -0,0 +1,117 @@
+import pytest
+from app.services.replica_service import CreatorReplica, ReplicaStaleError
+
+
+@pytest.fixture
+def supabase(fake_supabase):
+    fake_supabase.tables["creators"] = [
+        {"id": "c1", "name": "Ann", "handle": "ann", "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"},
+        {"id": "c2", "name": "Bob", "handle": "bob", "created_at": "2024-01-02T00:00:00", "updated_at": "2024-01-02T00:00:00"},
+    ]
+    fake_supabase.tables["activities"] = [
+        {"id": "a1", "creator_id": "c1", "type": "Email", "metadata": {"body": "hi"},
+         "created_at": "2024-01-03T00:00:00", "updated_at": "2024-01-03T00:00:00"},
+        {"id": "a2", "creator_id": "c2", "type": "call_made", "metadata": {"body": "call"},
+         "created_at": "2024-01-04T00:00:00", "updated_at": "2024-01-04T00:00:00"},
+    ]
+    return fake_supabase
+
+
+def test_reads_require_initial_sync(supabase):
+    replica = CreatorReplica(supabase)
+    with pytest.raises(ReplicaStaleError):
+        replica.get_all_creators()
+
+
+def test_sync_and_read(supabase):
+    replica = CreatorReplica(supabase, page_size=1)
+    assert replica.sync() == {"creators": 2, "activities": 2}
+    assert replica.get_creator("c2")["name"] == "Bob"
+    assert [c["id"] for c in replica.get_all_creators()] == ["c1", "c2"]
+    assert [a["id"] for a in replica.get_activities(activity_type="Email")] == ["a1"]
+
+
+def test_update_during_sync_does_not_skip_rows(supabase):
+    supabase.tables["creators"] = [
+        {"id": f"c{i}", "name": f"Creator {i}", "created_at": f"2024-01-0{i}T00:00:00",
+         "updated_at": f"2024-01-0{i}T00:00:00"}
+        for i in range(1, 5)
+    ]
+    replica = CreatorReplica(supabase, page_size=2)
+    calls = []
+
+    def update_c1_after_first_page():
+        calls.append(1)
+        if len(calls) == 1:
+            supabase.tables["creators"][0]["updated_at"] = "2024-02-01T00:00:00"
+
+    supabase.on_execute = update_c1_after_first_page
+    replica.sync_table("creators")
+    supabase.on_execute = None
+    replica.sync()
+    assert sorted(c["id"] for c in replica.get_all_creators()) == ["c1", "c2", "c3", "c4"]
+
+
+def test_rows_sharing_a_timestamp_are_all_synced(supabase):
+    supabase.tables["creators"] = [
+        {"id": f"c{i}", "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+        for i in range(5)
+    ]
+    replica = CreatorReplica(supabase, page_size=2)
+    assert replica.sync()["creators"] == 5
+
+
+def test_late_write_inside_overlap_window_is_pulled(supabase):
+    replica = CreatorReplica(supabase, overlap=60)
+    replica.sync()
+    # A client with a lagging clock writes a row stamped just before the mark
+    supabase.tables["creators"].append(
+        {"id": "c3", "name": "Cy", "created_at": "2024-01-01T23:59:30", "updated_at": "2024-01-01T23:59:30"}
+    )
+    assert replica.sync()["creators"] == 1
+    assert replica.get_creator("c3")["name"] == "Cy"
+
+
+def test_deleted_rows_are_reconciled(supabase):
+    replica = CreatorReplica(supabase, reconcile_interval=0)
+    deleted = []
+    replica.add_delete_listener(lambda table, ids: deleted.extend(ids))
+    replica.sync()
+    supabase.tables["creators"].pop(1)
+    replica.sync()
+    assert [c["id"] for c in replica.get_all_creators()] == ["c1"]
+    assert deleted == ["c2"]
+
+
+def test_rows_without_updated_at_are_reconciled(supabase):
+    supabase.tables["activities"].append(
+        {"id": "a0", "creator_id": "c1", "type": "Email", "metadata": {"body": "ingested"},
+         "created_at": "2024-01-05T00:00:00", "updated_at": None}
+    )
+    replica = CreatorReplica(supabase, reconcile_interval=0)
+    assert replica.sync() == {"creators": 2, "activities": 3}
+    # The next pass still works and doesn't re-count the unchanged row
+    assert replica.sync() == {"creators": 0, "activities": 0}
+    assert "a0" in [a["id"] for a in replica.get_activities(activity_type="Email")]
+
+
+def test_incremental_sync_only_pulls_changes(supabase):
+    replica = CreatorReplica(supabase)
+    replica.sync()
+    supabase.tables["creators"][0] = dict(supabase.tables["creators"][0], name="Anna", updated_at="2024-02-01T00:00:00")
+    assert replica.sync() == {"creators": 1, "activities": 0}
+    assert replica.get_creator("c1")["name"] == "Anna"
+
+
+def test_stale_replica_rejects_reads(supabase):
+    replica = CreatorReplica(supabase, max_staleness=0)
+    replica.sync()
+    replica.last_synced_at -= 1
+    with pytest.raises(ReplicaStaleError):
+        replica.get_creator("c1")
+
+
+def test_iter_rows_reads_in_batches(supabase):
+    replica = CreatorReplica(supabase)
+    replica.sync()
+    assert [row["id"] for row in replica.iter_rows("activities", batch_size=1)] == ["a1", "a2"]
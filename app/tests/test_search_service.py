@@ -0,0 +1,69 @@
+from app.services.search_service import SearchIndex, tokenize
+
+
+def build_index():
+    index = SearchIndex()
+    index.index_rows("creators", [
+        {"id": "c1", "name": "Jane Doe", "handle": "jane_doe_fit"},
+        {"id": "c2", "name": "John Smith", "handle": "jsmith"},
+    ])
+    index.index_rows("activities", [
+        {"id": "a1", "creator_id": "c1", "type": "email_sent",
+         "metadata": {"body": "Our rate is $500 per reel, two deliverables per month"}},
+        {"id": "a2", "creator_id": "c2", "type": "email_received",
+         "metadata": {"body": "Happy with the rate, can we add a story deliverable?"}},
+        {"id": "a3", "creator_id": "c2", "type": "call_made",
+         "metadata": {"body": "Automated call about rates"}},
+    ])
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Rate: $500/Reel") == ["rate", "500", "reel"]
+    assert tokenize(None) == []
+
+
+def test_prefix_match_on_handle():
+    results = build_index().search("jane_d", kinds=["creator"])
+    assert [r["id"] for r in results] == ["c1"]
+
+
+def test_all_tokens_must_match():
+    results = build_index().search("rate deliverable")
+    assert {r["id"] for r in results} == {"a1", "a2"}
+
+
+def test_activity_type_filter():
+    results = build_index().search("rate", activity_types=["call_made"])
+    assert [r["id"] for r in results] == ["a3"]
+
+
+def test_reindexing_replaces_document():
+    index = build_index()
+    index.index_activity({"id": "a1", "creator_id": "c1", "type": "email_sent",
+                          "metadata": {"body": "Contract signed"}})
+    assert "a1" not in {r["id"] for r in index.search("reel")}
+    assert [r["id"] for r in index.search("contract")] == ["a1"]
+
+
+def test_removed_rows_are_not_returned():
+    index = build_index()
+    index.remove_rows("activities", ["a1"])
+    assert {r["id"] for r in index.search("rate")} == {"a2", "a3"}
+
+
+def test_common_terms_are_capped_to_strongest_candidates(monkeypatch):
+    monkeypatch.setattr("app.services.search_service.MAX_CANDIDATES", 5)
+    index = SearchIndex()
+    filler = " ".join(f"filler{i}" for i in range(40))
+    index.index_rows("activities", [
+        {"id": f"a{i}", "creator_id": "c1", "type": "email_sent", "metadata": {"body": f"rate {filler}"}}
+        for i in range(50)
+    ] + [
+        {"id": "best", "creator_id": "c1", "type": "email_sent", "metadata": {"body": "rate rate"}}
+    ])
+    results = index.search("rate", limit=3)
+    assert results[0]["id"] == "best"
+    assert len(results) == 3
+    # Creator-scoped queries score the creator's documents directly
+    assert index.search("rate", creator_id="c2") == []